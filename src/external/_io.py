@@ -0,0 +1,198 @@
+"""Shared file I/O helpers for the external tool wrappers.
+
+Private module used by msi2lmp, msi2namd and packmol: input staging (reflink or
+copy), memoized SHA-256 hashing, and unbuffered artifact writes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def ensure_file(f: Path) -> None:
+    """Raise FileNotFoundError if file does not exist (one stat call)."""
+    if not is_regular_file(f):
+        raise FileNotFoundError(f"File not found: {f}")
+
+
+def is_regular_file(f: Path) -> bool:
+    """Return True if f exists and is a regular file (follows symlinks)."""
+    try:
+        return stat.S_ISREG(os.stat(f).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def stage_file(src_path: Path, work_dir: Path) -> Path:
+    """Ensure src_path is present in work_dir; reflink/copy only if needed; return destination path."""
+    src = Path(src_path).resolve()
+    ensure_file(src)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    dest = work_dir / src.name
+
+    # If dest is already the very same file (one stat pair, no path resolution), nothing to do.
+    try:
+        if os.path.samefile(src, dest):
+            return dest
+    except OSError:
+        # dest missing or unreadable: fall through to the content check
+        pass
+
+    try:
+        if _same_file_content(src, dest):
+            return dest
+    except Exception:
+        pass
+
+    reflink_or_copy(src, dest)
+    return dest
+
+
+# Linux FICLONE ioctl: share the source's extents (copy-on-write) instead of copying bytes
+_FICLONE = 0x40049409
+
+
+def reflink_or_copy(src: Path, dest: Path) -> None:
+    """Clone src to dest where the filesystem supports reflinks (btrfs, XFS, ...),
+    else fall back to shutil.copy2. Metadata follows copy2 semantics either way.
+
+    Never a hard link: the staged file must stay a snapshot even if src is later
+    rewritten in place. An existing dest is unlinked first, so a link left by an
+    older staging is replaced rather than written through.
+    """
+    if os.path.lexists(dest):
+        os.unlink(dest)
+    try:
+        import fcntl
+
+        with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except (ImportError, OSError):
+        shutil.copy2(str(src), str(dest))
+        return
+    shutil.copystat(str(src), str(dest))
+
+
+def _same_file_content(a: Path, b: Path, chunk_size: int = 1024 * 1024) -> bool:
+    """Return True if b exists and holds the same bytes as a.
+
+    Shallow then deep: differing sizes mean different content; equal size and
+    mtime (as left by a previous copy2) is taken as identical; otherwise the
+    files are compared block by block with early exit.
+    """
+    try:
+        sb = os.stat(b)
+    except FileNotFoundError:
+        return False
+    sa = os.stat(a)
+    if sa.st_size != sb.st_size:
+        return False
+    if sa.st_mtime_ns == sb.st_mtime_ns:
+        return True
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            ca = fa.read(chunk_size)
+            if ca != fb.read(chunk_size):
+                return False
+            if not ca:
+                return True
+
+
+# Files at least this large are hashed through a read-only mmap (no userspace copy)
+_MMAP_HASH_THRESHOLD = 16 * 1024 * 1024
+_HAS_FILE_DIGEST = hasattr(hashlib, "file_digest")
+
+# (st_dev, st_ino, st_size, st_mtime_ns, st_ctime_ns) -> sha256 hex digest
+_sha256_cache: dict[tuple[int, int, int, int, int], str] = {}
+_SHA256_CACHE_MAX = 256
+
+
+def sha256_file(p: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Compute SHA256 hash of a file.
+
+    Large files are fed to the hasher through a read-only mmap; smaller files use
+    hashlib.file_digest (Python 3.11+) or readinto() on one reused buffer.
+    Digests are memoized per file identity, so re-hashing an unchanged file
+    (same inode, size, mtime and ctime) does not read it again.
+    """
+    with open(p, "rb", buffering=0) as fh:
+        st = os.fstat(fh.fileno())
+        key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        cached = _sha256_cache.get(key)
+        if cached is not None:
+            return cached
+        h = hashlib.sha256()
+        if st.st_size >= _MMAP_HASH_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        elif _HAS_FILE_DIGEST:
+            h = hashlib.file_digest(fh, "sha256")
+        else:
+            buf = bytearray(chunk_size)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    digest = h.hexdigest()
+    _remember_sha256(st, digest)
+    return digest
+
+
+def _remember_sha256(st: os.stat_result, digest: str) -> None:
+    if len(_sha256_cache) >= _SHA256_CACHE_MAX:
+        _sha256_cache.clear()
+    _sha256_cache[(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)] = digest
+
+
+def write_and_hash(path: Path, data: bytes) -> str:
+    """Write data to path and return its SHA-256, hashed from memory (no read-back).
+
+    The digest is recorded under the written file's identity, so a later
+    sha256_file(path) on the unchanged file is a cache hit.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        st = os.fstat(fd)
+    finally:
+        os.close(fd)
+    _remember_sha256(st, digest)
+    return digest
+
+
+def sha256_files(paths: dict[str, Path]) -> dict[str, str]:
+    """Compute sha256_file for each named path concurrently; returns name -> hex digest.
+
+    hashlib releases the GIL while hashing, so the files are read and digested in
+    parallel and the total time approaches that of the largest file.
+    """
+    if len(paths) <= 1:
+        return {k: sha256_file(p) for k, p in paths.items()}
+    with ThreadPoolExecutor(max_workers=len(paths)) as ex:
+        digests = list(ex.map(sha256_file, paths.values()))
+    return dict(zip(paths.keys(), digests))
+
+
+def write_bytes(path: Path, data: bytes) -> None:
+    """Create/truncate path and write data with unbuffered os.write calls.
+
+    No fsync: these are reproducible workspace artifacts, not durable state.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
@@ -0,0 +1,105 @@
+"""CAR cell parsing and LAMMPS box geometry for the msi2lmp wrapper.
+
+Private module: reads the PBC line of a CAR file and converts the cell to
+LAMMPS box/tilt parameters. Used by _lmp_normalize and msi2lmp.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Tuple
+
+_FLOAT_TOKEN_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+_PLAIN_NUMBER_CHARS = frozenset("0123456789.+-eE")
+
+# The CAR PBC line is only looked for in the first N lines
+_CAR_HEADER_SCAN_LINES = 200
+
+
+def parse_abc_from_car(p: Path) -> tuple[float | None, float | None, float | None]:
+    """Parse a/b/c lattice parameters from a CAR file PBC line (legacy)."""
+    cell = parse_cell_from_car(p)
+    return cell[0], cell[1], cell[2]
+
+
+def parse_cell_from_car(
+    p: Path,
+) -> Tuple[float | None, float | None, float | None, float | None, float | None, float | None]:
+    """Parse full cell parameters (a, b, c, alpha, beta, gamma) from a CAR PBC line.
+
+    Results are memoized per (path, mtime, size), so repeated runs on an unchanged
+    CAR do not reopen it.
+    """
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None, None, None, None, None, None
+    return _parse_cell_from_car_cached(os.fspath(p), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _parse_cell_from_car_cached(
+    path: str, mtime_ns: int, size: int
+) -> Tuple[float | None, float | None, float | None, float | None, float | None, float | None]:
+    """Scan the CAR header for the PBC line (mtime_ns/size only key the cache)."""
+    a = b = c = alpha = beta = gamma = None
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+            # The PBC line is part of the CAR header; never scan into the atom records
+            for line in islice(fh, _CAR_HEADER_SCAN_LINES):
+                s = line.strip()
+                if s.upper().startswith("PBC") and "=" not in s:
+                    # Well-formed line: "PBC a b c alpha beta gamma [group]" parses
+                    # with a plain split; anything else falls back to the regex.
+                    toks = s.split(None, 7)[1:7]
+                    if len(toks) == 6 and all(_PLAIN_NUMBER_CHARS.issuperset(t) for t in toks):
+                        try:
+                            a, b, c, alpha, beta, gamma = map(float, toks)
+                            break
+                        except ValueError:
+                            a = b = c = alpha = beta = gamma = None
+                    # Only the first six numbers (a, b, c, alpha, beta, gamma) are used
+                    nums = [m.group() for m in islice(_FLOAT_TOKEN_RE.finditer(s), 6)]
+                    if len(nums) >= 6:
+                        a, b, c = float(nums[0]), float(nums[1]), float(nums[2])
+                        alpha, beta, gamma = float(nums[3]), float(nums[4]), float(nums[5])
+                    elif len(nums) >= 3:
+                        a, b, c = float(nums[0]), float(nums[1]), float(nums[2])
+                        alpha, beta, gamma = 90.0, 90.0, 90.0
+                    break
+    except Exception:
+        pass
+    return a, b, c, alpha, beta, gamma
+
+
+def is_triclinic(alpha: float, beta: float, gamma: float, tol: float = 0.01) -> bool:
+    """Return True if any cell angle differs from 90 degrees."""
+    return (abs(alpha - 90.0) > tol or abs(beta - 90.0) > tol or abs(gamma - 90.0) > tol)
+
+
+def compute_lammps_tilt(
+    a: float, b: float, c: float, alpha: float, beta: float, gamma: float
+) -> dict[str, float]:
+    """Convert crystallographic cell to LAMMPS box parameters.
+
+    Returns dict with keys: lx, ly, lz, xy, xz, yz.
+    For orthogonal cells, xy=xz=yz=0.
+    """
+    alpha_r = math.radians(alpha)
+    beta_r = math.radians(beta)
+    gamma_r = math.radians(gamma)
+
+    lx = a
+    xy = b * math.cos(gamma_r)
+    xz = c * math.cos(beta_r)
+    ly = math.sqrt(max(0.0, b * b - xy * xy))
+    if ly < 1e-12:
+        raise ValueError(f"Degenerate cell: sin(gamma) ~ 0 for gamma={gamma}")
+    yz = (b * c * math.cos(alpha_r) - xy * xz) / ly
+    lz = math.sqrt(max(0.0, c * c - xz * xz - yz * yz))
+    return {"lx": lx, "ly": ly, "lz": lz, "xy": xy, "xz": xz, "yz": yz}
@@ -2,71 +2,146 @@
 
 Private module containing post-processing normalization for LAMMPS .data files,
 including header normalization, coordinate shifting, and triclinic box support.
+CAR cell parsing and tilt computation live in _lmp_cell and are re-exported here.
 """
 
 from __future__ import annotations
 
-import math
+import os
 import re
+from array import array
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
 
+import numpy as np
 
-def parse_abc_from_car(p: Path) -> tuple[float | None, float | None, float | None]:
-    """Parse a/b/c lattice parameters from a CAR file PBC line (legacy)."""
-    cell = parse_cell_from_car(p)
-    return cell[0], cell[1], cell[2]
+# The cell helpers are also re-exported from here for existing importers
+from ._lmp_cell import (
+    compute_lammps_tilt,
+    is_triclinic,
+    parse_abc_from_car,
+    parse_cell_from_car,
+)
 
+# Section headers that terminate the Atoms block in a LAMMPS data file
+_SECTION_NAMES = (
+    "Bonds", "Angles", "Dihedrals", "Impropers", "Velocities", "Masses",
+    "Pair Coeffs", "Bond Coeffs", "Angle Coeffs", "Dihedral Coeffs", "Improper Coeffs",
+)
+_SECTION_HEADER_RE = re.compile(r"^(" + "|".join(_SECTION_NAMES) + r")\b", re.IGNORECASE)
+# First characters of the section names; atom lines start with a digit, so this
+# rejects them before the regex runs.
+_SECTION_INITIALS = frozenset(n[0] for n in _SECTION_NAMES) | frozenset(n[0].lower() for n in _SECTION_NAMES)
+_ATOMS_STYLE_RE = re.compile(r"^\s*Atoms\s*(?:#\s*(\w+))?")
+_NUMERIC_RE = re.compile(r"^[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?$")
 
-def parse_cell_from_car(
-    p: Path,
-) -> Tuple[float | None, float | None, float | None, float | None, float | None, float | None]:
-    """Parse full cell parameters (a, b, c, alpha, beta, gamma) from a CAR PBC line."""
-    a = b = c = alpha = beta = gamma = None
+# Header keywords (xlo/xhi, Atoms, ...) are only looked for in the first N lines
+_HEADER_SCAN_LINES = 300
+# x/y/z column indices per known atom style
+_XYZ_COLUMNS = {"full": (4, 5, 6), "molecular": (3, 4, 5), "atomic": (2, 3, 4)}
+_IO_BUFSIZE = 1 << 20
+# z shifts smaller than this are treated as zero (no Atoms rewrite)
+_Z_SHIFT_EPS = 1e-9
+
+
+def _is_atoms_header(line: str) -> bool:
+    """Return True for an 'Atoms' section header line (optionally '# style')."""
+    s = line.lstrip()
+    return s.startswith("Atoms") and (len(s) == 5 or s[5] in " \t#")
+
+
+def _extract_xyz_tokens(
+    parts: list[str], style: str
+) -> tuple[float | None, float | None, float | None, int | None]:
+    """Return (x, y, z, z_index) for an Atoms line split into tokens.
+
+    Known styles use fixed columns; otherwise the last three numeric tokens are used.
+    Returns all None when the line cannot be parsed.
+    """
     try:
-        with open(p, "r", encoding="utf-8", errors="ignore") as fh:
-            for line in fh:
-                s = line.strip()
-                if s.upper().startswith("PBC") and "=" not in s.upper():
-                    nums = re.findall(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", s)
-                    if len(nums) >= 6:
-                        a, b, c = float(nums[0]), float(nums[1]), float(nums[2])
-                        alpha, beta, gamma = float(nums[3]), float(nums[4]), float(nums[5])
-                    elif len(nums) >= 3:
-                        a, b, c = float(nums[0]), float(nums[1]), float(nums[2])
-                        alpha, beta, gamma = 90.0, 90.0, 90.0
-                    break
+        if style in _XYZ_COLUMNS:
+            x_i, y_i, z_i = _XYZ_COLUMNS[style]
+        else:
+            # Fallback: last three numeric tokens
+            z_i = y_i = x_i = None
+            count = 0
+            for idx in range(len(parts) - 1, -1, -1):
+                tok = parts[idx]
+                if _NUMERIC_RE.match(tok):
+                    count += 1
+                    if count == 1:
+                        z_i = idx
+                    elif count == 2:
+                        y_i = idx
+                    elif count == 3:
+                        x_i = idx
+                        break
+            if x_i is None or y_i is None or z_i is None:
+                return None, None, None, None
+        return float(parts[x_i]), float(parts[y_i]), float(parts[z_i]), z_i
     except Exception:
-        pass
-    return a, b, c, alpha, beta, gamma
+        return None, None, None, None
+
 
+def _z_reader(style: str):
+    """Return a function mapping Atoms line tokens to (z, z_index), or (None, None).
 
-def is_triclinic(alpha: float, beta: float, gamma: float, tol: float = 0.01) -> bool:
-    """Return True if any cell angle differs from 90 degrees."""
-    return (abs(alpha - 90.0) > tol or abs(beta - 90.0) > tol or abs(gamma - 90.0) > tol)
+    Resolved once per file: known styles get a fixed-column reader (a line counts
+    only if x, y and z all parse, as in _extract_xyz_tokens); unknown styles fall
+    back to the per-line numeric token scan.
+    """
+    if style not in _XYZ_COLUMNS:
+        def read_z(parts: list[str]) -> tuple[float | None, int | None]:
+            _, _, z_val, z_index = _extract_xyz_tokens(parts, style)
+            return z_val, z_index
 
+        return read_z
 
-def compute_lammps_tilt(
-    a: float, b: float, c: float, alpha: float, beta: float, gamma: float
-) -> dict[str, float]:
-    """Convert crystallographic cell to LAMMPS box parameters.
+    x_i, y_i, z_i = _XYZ_COLUMNS[style]
 
-    Returns dict with keys: lx, ly, lz, xy, xz, yz.
-    For orthogonal cells, xy=xz=yz=0.
-    """
-    alpha_r = math.radians(alpha)
-    beta_r = math.radians(beta)
-    gamma_r = math.radians(gamma)
+    def read_z_fixed(parts: list[str]) -> tuple[float | None, int | None]:
+        try:
+            float(parts[x_i])
+            float(parts[y_i])
+            return float(parts[z_i]), z_i
+        except (ValueError, IndexError):
+            return None, None
+
+    return read_z_fixed
 
-    lx = a
-    xy = b * math.cos(gamma_r)
-    xz = c * math.cos(beta_r)
-    ly = math.sqrt(max(0.0, b * b - xy * xy))
-    if ly < 1e-12:
-        raise ValueError(f"Degenerate cell: sin(gamma) ~ 0 for gamma={gamma}")
-    yz = (b * c * math.cos(alpha_r) - xy * xz) / ly
-    lz = math.sqrt(max(0.0, c * c - xz * xz - yz * yz))
-    return {"lx": lx, "ly": ly, "lz": lz, "xy": xy, "xz": xz, "yz": yz}
+
+@lru_cache(maxsize=64)
+def _atoms_line_format(n_tokens: int, float_cols: tuple[int, ...]) -> str:
+    """%-format template for a rewritten Atoms line: '%.6f' at float_cols, '%s' elsewhere."""
+    return " ".join("%.6f" if i in float_cols else "%s" for i in range(n_tokens))
+
+
+def _split_comment(line: str) -> tuple[str, str]:
+    """Split an Atoms line into (head, tail) where tail is ' #comment' or ''."""
+    if "#" not in line:
+        return line, ""
+    head, sep, comment = line.partition("#")
+    # Ensure a space before '#' so image flags and comments don't merge
+    return head, " " + sep + comment
+
+
+def _iter_lines(fh):
+    """Yield lines from a text file handle without their trailing newline."""
+    for raw in fh:
+        yield raw[:-1] if raw.endswith("\n") else raw
+
+
+def _copy_rest(fin, fout) -> None:
+    """Copy the remainder of fin to fout in blocks, terminating the output with a newline."""
+    last = ""
+    while True:
+        chunk = fin.read(_IO_BUFSIZE)
+        if not chunk:
+            break
+        fout.write(chunk)
+        last = chunk
+    if last and not last.endswith("\n"):
+        fout.write("\n")
 
 
 def normalize_data_file(
@@ -81,6 +156,11 @@ def normalize_data_file(
 ) -> None:
     """Normalize LAMMPS .data file header and optionally shift Z coordinates.
 
+    The file is processed in two streaming passes (scan, then rewrite into a
+    sibling temp file that atomically replaces the original), so memory use
+    does not scale with the size of the non-Atoms sections. Everything after
+    the last edited line is block-copied rather than handled line by line.
+
     Parameters:
     - data_path: Path to the LAMMPS .data file to normalize in-place
     - a_dim: CAR PBC a dimension (x extent)
@@ -96,6 +176,8 @@ def normalize_data_file(
     def _fmt(x: float) -> str:
         return f"{x:.6f}"
 
+    data_path = Path(data_path)
+
     # Determine if triclinic
     triclinic = False
     tilt = None
@@ -106,25 +188,101 @@ def normalize_data_file(
             c_val = z_target if z_target is not None else 100.0  # fallback
             tilt = compute_lammps_tilt(a_dim, b_dim, c_val, alpha, beta, gamma)
 
-    # Read file
-    with open(data_path, "r", encoding="utf-8", errors="ignore") as fh:
-        lines = fh.read().splitlines()
+    # z statistics are only needed when atoms are shifted/centered
+    need_z = bool(do_z_shift or do_z_center)
 
-    # Find header bounds and indices
+    # Pass 1 (read-only): find header indices and the Atoms section; collect the
+    # z column (shift/center) and x/y columns (triclinic wrap) for vectorized updates.
     x_idx = y_idx = z_idx = None
     tilt_idx = None  # existing "xy xz yz" line if present
+    box_lines: dict[int, str] = {}  # original text of the box/tilt lines, by index
     atoms_header_idx = None
-    for i, line in enumerate(lines[:300]):
-        if re.search(r"\bxlo\s+xhi\b", line):
-            x_idx = i
-        elif re.search(r"\bylo\s+yhi\b", line):
-            y_idx = i
-        elif re.search(r"\bzlo\s+zhi\b", line):
-            z_idx = i
-        elif re.search(r"\bxy\s+xz\s+yz\b", line):
-            tilt_idx = i
-        if atoms_header_idx is None and re.match(r"^\s*Atoms\b", line):
-            atoms_header_idx = i
+    atoms_end_idx = None  # section header terminating the Atoms block
+    style = "unknown"
+    xi = yi = None
+    zs: list[float] = []
+    xs: list[float] = []
+    ys: list[float] = []
+    # Per non-blank Atoms line, in file order: z token index (-1 if no z was read)
+    # and whether x/y were read, so pass 2 substitutes values without re-parsing.
+    z_cols = array("i")
+    wrap_ok = bytearray()
+    with open(data_path, "r", encoding="utf-8", errors="ignore", buffering=_IO_BUFSIZE) as fh:
+        in_atoms = False
+        for i, line in enumerate(_iter_lines(fh)):
+            # Box/tilt lines precede all sections, so the header scan ends at the
+            # Atoms header (or after _HEADER_SCAN_LINES lines, whichever is first).
+            if atoms_header_idx is None and i < _HEADER_SCAN_LINES:
+                # Plain substring checks; header lines are short and regex setup dominates.
+                if "xlo" in line and "xhi" in line:
+                    x_idx = i
+                    box_lines[i] = line
+                elif "ylo" in line and "yhi" in line:
+                    y_idx = i
+                    box_lines[i] = line
+                elif "zlo" in line and "zhi" in line:
+                    z_idx = i
+                    box_lines[i] = line
+                elif "xy" in line and "xz" in line and "yz" in line:
+                    tilt_idx = i
+                    box_lines[i] = line
+                if _is_atoms_header(line):
+                    atoms_header_idx = i
+                    # Determine atom style (from header comment, e.g., 'Atoms # full')
+                    m = _ATOMS_STYLE_RE.match(line)
+                    if m and m.group(1):
+                        style = m.group(1).strip().lower()
+                    # Wrap XY coordinates into the triclinic bounding box.
+                    # msi2lmp recenters atoms which can push them outside the periodic cell.
+                    # Wrapping in fractional ab-plane only (not z — may have vacuum).
+                    # Unknown styles are not wrapped.
+                    if triclinic and tilt is not None and style in _XYZ_COLUMNS:
+                        xi, yi = _XYZ_COLUMNS[style][:2]
+                        min_len = max(xi, yi) + 1
+                    if not need_z and xi is None:
+                        # Atoms lines will not be rewritten; nothing further to scan
+                        break
+                    read_z = _z_reader(style)
+                    in_atoms = True
+                    continue
+            if not in_atoms:
+                if i < _HEADER_SCAN_LINES:
+                    continue
+                # Past the header scan with no Atoms section: nothing left to find
+                break
+            s = line.strip()
+            if s and s[0] in _SECTION_INITIALS and _SECTION_HEADER_RE.match(s):
+                # Header edits precede Atoms, so the rest of the file needs no scan
+                atoms_end_idx = i
+                break
+            if not need_z and xi is None:
+                continue
+            left = _split_comment(line)[0].strip()
+            if not left:
+                continue
+            parts = left.split()
+            z_col = -1
+            if need_z:
+                z_val, z_index = read_z(parts)
+                if z_val is not None:
+                    zs.append(z_val)
+                    z_col = z_index
+            z_cols.append(z_col)
+            ok = False
+            if xi is not None and len(parts) >= min_len:
+                try:
+                    x_val = float(parts[xi])
+                    y_val = float(parts[yi])
+                except ValueError:
+                    pass
+                else:
+                    xs.append(x_val)
+                    ys.append(y_val)
+                    ok = True
+            wrap_ok.append(ok)
+
+    # Replacement header lines keyed by their original line index
+    header_repl: dict[int, str] = {}
 
     # Update XY header extents
     if do_xy:
@@ -132,98 +290,39 @@ def normalize_data_file(
             # For triclinic: LAMMPS data file uses internal box coords (xlo=0, xhi=lx).
             # The tilt factors on the separate xy/xz/yz line define the skew.
             if x_idx is not None:
-                lines[x_idx] = f"0.000000 {_fmt(tilt['lx'])} xlo xhi"
+                header_repl[x_idx] = f"0.000000 {_fmt(tilt['lx'])} xlo xhi"
             if y_idx is not None:
-                lines[y_idx] = f"0.000000 {_fmt(tilt['ly'])} ylo yhi"
+                header_repl[y_idx] = f"0.000000 {_fmt(tilt['ly'])} ylo yhi"
         else:
             if a_dim is not None and x_idx is not None:
-                lines[x_idx] = f"0.000000 {_fmt(a_dim)} xlo xhi"
+                header_repl[x_idx] = f"0.000000 {_fmt(a_dim)} xlo xhi"
             if b_dim is not None and y_idx is not None:
-                lines[y_idx] = f"0.000000 {_fmt(b_dim)} ylo yhi"
+                header_repl[y_idx] = f"0.000000 {_fmt(b_dim)} ylo yhi"
 
     # Write or update tilt factors for triclinic cells
+    tilt_insert_after = None
+    tilt_line = None
     if triclinic and tilt is not None:
         tilt_line = f"{_fmt(tilt['xy'])} {_fmt(tilt['xz'])} {_fmt(tilt['yz'])} xy xz yz"
         if tilt_idx is not None:
-            lines[tilt_idx] = tilt_line
+            header_repl[tilt_idx] = tilt_line
         elif z_idx is not None:
             # Insert tilt line right after zlo/zhi
-            lines.insert(z_idx + 1, tilt_line)
-            # Adjust indices that follow
-            if atoms_header_idx is not None and atoms_header_idx > z_idx:
-                atoms_header_idx += 1
+            tilt_insert_after = z_idx
 
-    # Identify Atoms section range
+    z_shift = None
+    z_new: list[float] = []
     if atoms_header_idx is not None:
-        start = atoms_header_idx + 1
-        while start < len(lines) and (lines[start].strip() == "" or lines[start].lstrip().startswith("#")):
-            start += 1
-        end = start
-        section_header_pat = re.compile(
-            r"^(Bonds|Angles|Dihedrals|Impropers|Velocities|Masses|Pair Coeffs|Bond Coeffs|Angle Coeffs|Dihedral Coeffs|Improper Coeffs)\b",
-            re.IGNORECASE,
-        )
-        while end < len(lines):
-            s = lines[end].strip()
-            if s != "" and section_header_pat.match(s):
-                break
-            end += 1
-
-        # Determine atom style (from header comment, e.g., 'Atoms # full')
-        style = "unknown"
-        m = re.search(r"^\s*Atoms\s*(?:#\s*(\w+))?", lines[atoms_header_idx])
-        if m and m.group(1):
-            style = m.group(1).strip().lower()
-
-        def _extract_xyz_tokens(parts: list[str]) -> tuple[float | None, float | None, float | None, int | None]:
-            try:
-                if style == "full":
-                    x_i, y_i, z_i = 4, 5, 6
-                elif style == "molecular":
-                    x_i, y_i, z_i = 3, 4, 5
-                elif style == "atomic":
-                    x_i, y_i, z_i = 2, 3, 4
-                else:
-                    # Fallback: last three numeric tokens
-                    z_i = y_i = x_i = None
-                    count = 0
-                    for idx in range(len(parts) - 1, -1, -1):
-                        tok = parts[idx]
-                        if re.match(r"^[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?$", tok):
-                            count += 1
-                            if count == 1:
-                                z_i = idx
-                            elif count == 2:
-                                y_i = idx
-                            elif count == 3:
-                                x_i = idx
-                                break
-                    if x_i is None or y_i is None or z_i is None:
-                        return None, None, None, None
-                return float(parts[x_i]), float(parts[y_i]), float(parts[z_i]), z_i
-            except Exception:
-                return None, None, None, None
-
-        # Pass 1: compute z_min and z_max
-        z_min = float("inf")
-        z_max = -float("inf")
-        for j in range(start, end):
-            line = lines[j]
-            left = line.split("#", 1)[0].strip()
-            if not left:
-                continue
-            parts = left.split()
-            _, _, z_val, _ = _extract_xyz_tokens(parts)
-            if z_val is None:
-                continue
-            if z_val < z_min:
-                z_min = z_val
-            if z_val > z_max:
-                z_max = z_val
+        # z_min/z_max as a vectorized reduction over the collected column
+        z_arr = np.fromiter(zs, dtype=np.float64, count=len(zs))
+        if z_arr.size:
+            z_min = float(z_arr.min())
+            z_max = float(z_arr.max())
+        else:
+            z_min = float("inf")
+            z_max = -float("inf")
 
-        # Pass 2 (optional): rewrite atoms lines with uniformly shifted z.
         # Precedence: centering wins over legacy min(z)=0 shifting.
-        z_shift = None
         if do_z_center:
             if z_target is not None and z_min != float("inf") and z_max != -float("inf"):
                 z_mid = 0.5 * (z_min + z_max)
@@ -232,22 +331,12 @@ def normalize_data_file(
             if z_min != float("inf"):
                 z_shift = -z_min
 
+        if z_shift is not None and abs(z_shift) < _Z_SHIFT_EPS:
+            # Coordinates already in place: leave the Atoms lines untouched
+            z_shift = None
         if z_shift is not None:
-            for j in range(start, end):
-                original = lines[j]
-                head, sep, comment = original.partition("#")
-                left = head.strip()
-                if not left:
-                    continue
-                parts = left.split()
-                _, _, z_val, z_index = _extract_xyz_tokens(parts)
-                if z_index is None or z_val is None:
-                    lines[j] = original.rstrip()
-                    continue
-                parts[z_index] = _fmt(z_val + float(z_shift))
-                new_left = " ".join(parts)
-                # Ensure a space before '#' so image flags and comments don't merge
-                lines[j] = (new_left + (" " + sep + comment if sep else "")).rstrip()
+            # Shift the whole z column at once; consumed in file order in pass 2
+            z_new = (z_arr + float(z_shift)).tolist()
 
         # Update Z header:
         # - If z_target is provided, always normalize header to [0, z_target]
@@ -259,51 +348,95 @@ def normalize_data_file(
             else:
                 zhi_val = float(z_target)
             if zhi_val is not None:
-                lines[z_idx] = f"0.000000 {_fmt(zhi_val)} zlo zhi"
+                header_repl[z_idx] = f"0.000000 {_fmt(zhi_val)} zlo zhi"
 
-        # Wrap XY coordinates into the triclinic bounding box.
-        # msi2lmp recenters atoms which can push them outside the periodic cell.
-        # Wrapping in fractional ab-plane only (not z — may have vacuum).
-        if triclinic and tilt is not None:
-            lx_v = tilt["lx"]
-            ly_v = tilt["ly"]
-            xy_v = tilt["xy"]
-            # Determine x,y column indices from style
-            if style == "full":
-                xi, yi = 4, 5
-            elif style == "molecular":
-                xi, yi = 3, 4
-            elif style == "atomic":
-                xi, yi = 2, 3
-            else:
-                xi, yi = None, None  # skip wrapping for unknown style
-            if xi is not None and yi is not None:
-                for j in range(start, end):
-                    original = lines[j]
-                    head, sep, comment = original.partition("#")
-                    left = head.strip()
-                    if not left:
-                        continue
-                    parts = left.split()
-                    if len(parts) <= max(xi, yi):
-                        continue
-                    try:
-                        x_val = float(parts[xi])
-                        y_val = float(parts[yi])
-                    except ValueError:
-                        continue
-                    # Convert to fractional ab-plane: x = s*lx + t*xy, y = t*ly
-                    t_frac = y_val / ly_v
-                    s_frac = (x_val - t_frac * xy_v) / lx_v
-                    # Wrap to [0, 1)
-                    s_frac -= math.floor(s_frac)
-                    t_frac -= math.floor(t_frac)
-                    # Convert back to Cartesian
-                    parts[xi] = _fmt(s_frac * lx_v + t_frac * xy_v)
-                    parts[yi] = _fmt(t_frac * ly_v)
-                    new_left = " ".join(parts)
-                    lines[j] = (new_left + (" " + sep + comment if sep else "")).rstrip()
-
-    # Write back
-    with open(data_path, "w", encoding="utf-8") as outfh:
-        outfh.write("\n".join(lines) + "\n")
+    do_wrap = xi is not None
+    rewrite_atoms = z_shift is not None or do_wrap
+    x_new: list[float] = []
+    y_new: list[float] = []
+    if do_wrap:
+        lx_v = tilt["lx"]
+        ly_v = tilt["ly"]
+        xy_v = tilt["xy"]
+        x_arr = np.fromiter(xs, dtype=np.float64, count=len(xs))
+        y_arr = np.fromiter(ys, dtype=np.float64, count=len(ys))
+        # Convert to fractional ab-plane: x = s*lx + t*xy, y = t*ly
+        t_frac = y_arr / ly_v
+        s_frac = (x_arr - t_frac * xy_v) / lx_v
+        # Wrap to [0, 1); "+ 0.0" maps floor(-0.0) to 0.0 like math.floor's int result
+        s_frac -= np.floor(s_frac) + 0.0
+        t_frac -= np.floor(t_frac) + 0.0
+        # Convert back to Cartesian
+        x_new = (s_frac * lx_v + t_frac * xy_v).tolist()
+        y_new = (t_frac * ly_v).tolist()
+
+    # Header lines that already read exactly as normalized are not edits
+    header_repl = {i: text for i, text in header_repl.items() if box_lines.get(i) != text}
+    if not header_repl and tilt_insert_after is None and not rewrite_atoms:
+        # Nothing to change: leave the file (and its mtime) untouched
+        return
+
+    # Last line index needing per-line handling; the remainder is copied verbatim.
+    # None means the Atoms block being rewritten runs to end of file.
+    last_edit = max([*header_repl, -1 if tilt_insert_after is None else tilt_insert_after, -1])
+    copy_after: int | None = last_edit
+    if rewrite_atoms:
+        copy_after = None if atoms_end_idx is None else max(last_edit, atoms_end_idx)
+
+    # Pass 2: stream into a sibling temp file, rewriting header and Atoms lines.
+    tmp_path = data_path.with_name(data_path.name + ".tmp")
+    try:
+        with open(data_path, "r", encoding="utf-8", errors="ignore", buffering=_IO_BUFSIZE) as fin, open(
+            tmp_path, "w", encoding="utf-8", buffering=_IO_BUFSIZE
+        ) as fout:
+            in_atoms = False
+            j = k = w = 0
+            for i, line in enumerate(_iter_lines(fin)):
+                if i in header_repl:
+                    line = header_repl[i]
+                elif i == atoms_header_idx:
+                    in_atoms = rewrite_atoms
+                elif in_atoms:
+                    s = line.strip()
+                    if s and s[0] in _SECTION_INITIALS and _SECTION_HEADER_RE.match(s):
+                        in_atoms = False
+                    else:
+                        head, tail = _split_comment(line)
+                        left = head.strip()
+                        if left:
+                            parts = left.split()
+                            z_col = z_cols[j]
+                            ok = wrap_ok[j]
+                            j += 1
+                            # Rewritten coordinates are stored as floats and their
+                            # column indices collected for the cached %-format template.
+                            float_cols: tuple[int, ...] = ()
+                            if z_shift is not None:
+                                if z_col < 0:
+                                    line = line.rstrip()
+                                else:
+                                    parts[z_col] = z_new[k]
+                                    k += 1
+                                    float_cols = (z_col,)
+                            if ok:
+                                parts[xi] = x_new[w]
+                                parts[yi] = y_new[w]
+                                w += 1
+                                float_cols = tuple(sorted({*float_cols, xi, yi}))
+                            if float_cols:
+                                line = (_atoms_line_format(len(parts), float_cols) % tuple(parts) + tail).rstrip()
+                fout.write(line)
+                fout.write("\n")
+                if i == tilt_insert_after:
+                    fout.write(tilt_line)
+                    fout.write("\n")
+                if i == copy_after:
+                    _copy_rest(fin, fout)
+                    break
+        os.replace(tmp_path, data_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -10,7 +10,16 @@ import subprocess
 import time
 from pathlib import Path
 
-from .adapter import augment_env_with_exe_dir
+from .adapter import augment_env_with_exe_dir, decode_output
+from ._msi2lmp_helpers import LOG_TAIL_CHARS, tail_text
+
+
+# Block size for reading an .frc header; blocks are read until max_lines lines are in
+_FRC_SNIFF_BYTES = 32 * 1024
+
+# (st_dev, st_ino, st_size, st_mtime_ns, max_lines) -> frc_looks_cvff_labeled result
+_cvff_cache: dict[tuple[int, int, int, int, int], bool] = {}
+_CVFF_CACHE_MAX = 256
 
 
 def frc_looks_cvff_labeled(frc_path: Path, max_lines: int = 200) -> bool:
@@ -19,25 +28,50 @@ def frc_looks_cvff_labeled(frc_path: Path, max_lines: int = 200) -> bool:
     Some `msi2lmp.exe` builds expect CVFF-labeled section headers like
     `#atom_types\tcvff` and/or a `#define cvff` header.
 
-    We only scan the first N lines for determinism and speed.
+    We only scan the first N lines for determinism and speed. The header block is
+    read as bytes (markers are ASCII); files with no 'cvff' token are rejected
+    without any per-line work. Results are cached per file identity
+    (device, inode, size, mtime), so repeated runs against one .frc scan it once.
     """
     try:
-        with open(frc_path, "r", encoding="utf-8", errors="ignore") as fh:
-            for i, line in enumerate(fh):
-                if i >= max_lines:
+        st = os.stat(frc_path)
+    except Exception:
+        return False
+    # Results are memoized on file identity; any rewrite changes size or mtime.
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, max_lines)
+    hit = _cvff_cache.get(key)
+    if hit is None:
+        if len(_cvff_cache) >= _CVFF_CACHE_MAX:
+            _cvff_cache.clear()
+        hit = _cvff_cache[key] = _scan_frc_cvff(frc_path, max_lines)
+    return hit
+
+
+def _scan_frc_cvff(frc_path: Path, max_lines: int) -> bool:
+    try:
+        with open(frc_path, "rb") as fh:
+            blocks = []
+            newlines = 0
+            while newlines < max_lines:
+                block = fh.read(_FRC_SNIFF_BYTES)
+                if not block:
                     break
-                s = line.strip().lower()
-                if not s:
-                    continue
-                # Common CVFF markers
-                if "#define" in s and "cvff" in s:
-                    return True
-                if s.startswith("#atom_types") and "cvff" in s:
-                    return True
-                if s.startswith("#nonbond(12-6)") and "cvff" in s:
-                    return True
+                blocks.append(block)
+                newlines += block.count(b"\n")
     except Exception:
         return False
+    head = b"".join(blocks).lower()
+    if b"cvff" not in head:
+        return False
+    for raw in head.split(b"\n", max_lines)[:max_lines]:
+        s = raw.strip()
+        if b"cvff" not in s:
+            continue
+        # Common CVFF markers
+        if b"#define" in s:
+            return True
+        if s.startswith(b"#atom_types") or s.startswith(b"#nonbond(12-6)"):
+            return True
     return False
 
 
@@ -99,26 +133,75 @@ def build_msi2lmp_argv(
     return cmd
 
 
-def augment_env(exe_path: str) -> dict:
+def augment_env(exe_path: str, resolved: bool = False) -> dict:
     """Delegate to shared adapter helper for PATH augmentation."""
-    return augment_env_with_exe_dir(exe_path)
-
+    return augment_env_with_exe_dir(exe_path, resolved=resolved)
+
+
+def run_command(
+    cmd: list[str],
+    cwd: Path,
+    env: dict,
+    timeout_s: int,
+    stdout_path: Path | None = None,
+    stderr_path: Path | None = None,
+) -> tuple[float, str, str]:
+    """Run a command with deterministic cwd/env/timeout. Raises CalledProcessError on nonzero exit.
+
+    When stdout_path/stderr_path are given, the child writes straight into those
+    files (no pipe draining in Python) and the returned stdout/stderr are empty;
+    callers read what they need back with read_log_tail.
+    """
+    if stdout_path is None or stderr_path is None:
+        t0 = time.perf_counter()
+        try:
+            # Captured as bytes and decoded once below (no incremental text decoding
+            # while the pipes are drained).
+            proc = subprocess.run(
+                cmd,
+                cwd=str(cwd),
+                env=env,
+                # Hardening: prevent the external tool from blocking on stdin (observed as
+                # deterministic stalls/hangs in some environments).
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                timeout=timeout_s,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            e.stdout = decode_output(e.stdout)
+            e.stderr = decode_output(e.stderr)
+            raise
+        return (time.perf_counter() - t0, decode_output(proc.stdout), decode_output(proc.stderr))
 
-def run_command(cmd: list[str], cwd: Path, env: dict, timeout_s: int) -> tuple[float, str, str]:
-    """Run a command with deterministic cwd/env/timeout. Raises CalledProcessError on nonzero exit."""
     t0 = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(cwd),
-        env=env,
-        # Hardening: prevent the external tool from blocking on stdin (observed as
-        # deterministic stalls/hangs in some environments).
-        stdin=subprocess.DEVNULL,
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        timeout=timeout_s,
-        check=True,
-    )
-    return (time.perf_counter() - t0, proc.stdout, proc.stderr)
+    with open(stdout_path, "wb") as out_fh, open(stderr_path, "wb") as err_fh:
+        subprocess.run(
+            cmd,
+            cwd=str(cwd),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=out_fh,
+            stderr=err_fh,
+            timeout=timeout_s,
+            check=True,
+        )
+    return (time.perf_counter() - t0, "", "")
+
+
+def read_log_tail(path: Path, n: int = LOG_TAIL_CHARS) -> tuple[str, bool]:
+    """Return (last n characters of a log file, whether anything was cut).
+
+    Only the last 4*n bytes are read (a UTF-8 character is at most 4 bytes), so
+    the cost does not grow with the log; a file larger than that is always cut.
+    """
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            start = max(0, size - 4 * n)
+            fh.seek(start)
+            data = fh.read()
+    except OSError:
+        return "", False
+    text, cut = tail_text(decode_output(data), n)
+    return text, cut or start > 0
@@ -1,60 +1,42 @@
 """Helper utilities for msi2lmp wrapper.
 
-Private module containing file staging, hashing, and result persistence helpers.
+Private module containing log tailing and result persistence helpers; file
+staging and hashing live in the shared _io module.
 """
 
 from __future__ import annotations
 
-import filecmp
-import hashlib
 import json
-import shutil
+import os
 from pathlib import Path
 
+from ._io import write_bytes
 
-def ensure_file(f: Path) -> None:
-    """Raise FileNotFoundError if file does not exist."""
-    if not f.exists() or not f.is_file():
-        raise FileNotFoundError(f"File not found: {f}")
 
+# Embedded stdout/stderr are capped to this many trailing characters; the full
+# logs stay on disk (stdout_file/stderr_file, hashed in outputs_sha256).
+LOG_TAIL_CHARS = 4096
 
-def stage_file(src_path: Path, work_dir: Path) -> Path:
-    """Ensure src_path is present in work_dir; copy only if needed; return destination path."""
-    src = Path(src_path).resolve()
-    ensure_file(src)
-    work_dir.mkdir(parents=True, exist_ok=True)
-    dest = work_dir / src.name
-
-    # If already exactly the same path, nothing to do.
-    try:
-        if src.resolve() == dest.resolve():
-            return dest
-    except Exception:
-        pass
-
-    if dest.exists():
-        try:
-            if filecmp.cmp(str(src), str(dest), shallow=False):
-                return dest
-        except Exception:
-            pass
 
-    shutil.copy2(str(src), str(dest))
-    return dest
-
-
-def sha256_file(p: Path, chunk_size: int = 1024 * 1024) -> str:
-    """Compute SHA256 hash of a file."""
-    h = hashlib.sha256()
-    with open(p, "rb") as fh:
-        for chunk in iter(lambda: fh.read(chunk_size), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def tail_text(text: str, n: int = LOG_TAIL_CHARS) -> tuple[str, bool]:
+    """Return (last n characters of text, whether anything was cut)."""
+    if len(text) <= n:
+        return text, False
+    return text[-n:], True
 
 
 def write_result_json(work_dir: Path, envelope: dict) -> Path:
-    """Write deterministic result.json (sorted keys + newline) into work_dir."""
+    """Write deterministic result.json (sorted keys + newline) into work_dir.
+
+    The JSON is written with a single write() to a sibling temp file that is then
+    os.replace()d over result.json, so readers never observe a partial file.
+    """
     work_dir.mkdir(parents=True, exist_ok=True)
     out = work_dir / "result.json"
-    out.write_text(json.dumps(envelope, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    tmp = work_dir / "result.json.tmp"
+    # Encode once and write raw bytes (no text-layer re-encoding/newline translation).
+    # The envelope is a plain acyclic tree, so the encoder's cycle bookkeeping is skipped.
+    payload = json.dumps(envelope, indent=2, sort_keys=True, check_circular=False) + "\n"
+    write_bytes(tmp, payload.encode("utf-8"))
+    os.replace(tmp, out)
     return out
@@ -17,9 +17,12 @@ and return result.to_dict() with unified keys:
   - tool_version: Optional[str]
   - warnings: list[str] (optional; empty when none)
   - seed: Optional[int] (for RNG-driven tools like Packmol)
+  - stdout_truncated / stderr_truncated: bool (msi2lmp only; True when 'stdout'/'stderr'
+    hold only the last 4096 characters; the full logs are outputs['stdout_file'/'stderr_file'])
 
 Helpers provided here:
   - augment_env_with_exe_dir(exe_path) -> dict
+  - decode_output(data) -> str
   - get_tool_version(exe_path, timeout_s=5) -> str
 """
 
@@ -29,26 +32,45 @@ import shlex
 import shutil
 import subprocess
 import tempfile
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 
-def augment_env_with_exe_dir(exe_path: str, base_env: Optional[dict] = None) -> dict:
+def augment_env_with_exe_dir(
+    exe_path: str, base_env: Optional[dict] = None, resolved: bool = False
+) -> dict:
     """
     Prepend the executable's directory to PATH to improve dynamic linker resolution.
 
+    Pass resolved=True when exe_path is already canonical to skip Path.resolve().
     Returns a copy of the environment dict safe for subprocess.run(..., env=...).
     """
     env = (base_env.copy() if base_env is not None else os.environ.copy())
-    try:
-        exe_dir = str(Path(exe_path).resolve().parent)
-    except Exception:
-        exe_dir = str(Path(exe_path).parent)
+    if resolved:
+        exe_dir = os.path.dirname(exe_path)
+    else:
+        try:
+            exe_dir = str(Path(exe_path).resolve().parent)
+        except Exception:
+            exe_dir = str(Path(exe_path).parent)
     env["PATH"] = f"{exe_dir}:{env.get('PATH', '')}"
     return env
 
 
+def decode_output(data: Optional[Union[bytes, str]]) -> str:
+    """
+    Decode captured process output once: UTF-8 with undecodable bytes replaced and
+    newlines translated as text mode would (\r\n and \r become \n).
+    """
+    if not data:
+        return ""
+    text = data if isinstance(data, str) else data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 @dataclass
 class ExternalToolResult:
     """
@@ -83,44 +105,60 @@ class ExternalToolResult:
 
     def to_dict(self) -> Dict[str, Any]:
         # Produce a dict with stable keys; omit None fields but keep empty lists/dicts.
-        d = asdict(self)
-        if self.tool_version is None:
-            d.pop("tool_version", None)
-        if self.seed is None:
-            d.pop("seed", None)
-
-        # Ensure outputs are strings
-        d["outputs"] = {k: str(v) for k, v in (self.outputs or {}).items()}
-
-        # Ensure deterministic types for new stable keys
-        d["status"] = str(self.status) if self.status else "ok"
-        d["outputs_sha256"] = {k: str(v) for k, v in (self.outputs_sha256 or {}).items()}
+        # Built field by field (same order as the dataclass) with shallow copies of
+        # the containers instead of asdict()'s recursive deepcopy.
+        d: Dict[str, Any] = {
+            "tool": self.tool,
+            "argv": list(self.argv),
+            "cwd": self.cwd,
+            "duration_s": self.duration_s,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            # Ensure outputs are strings
+            "outputs": {k: str(v) for k, v in (self.outputs or {}).items()},
+            # Ensure deterministic types for new stable keys
+            "status": str(self.status) if self.status else "ok",
+            "outputs_sha256": {k: str(v) for k, v in (self.outputs_sha256 or {}).items()},
+        }
+        if self.tool_version is not None:
+            d["tool_version"] = self.tool_version
+        d["warnings"] = list(self.warnings)
+        if self.seed is not None:
+            d["seed"] = self.seed
 
         return d
 
 
-_VERSION_PATTERNS: List[re.Pattern[str]] = [
+# Version patterns in priority order. Each alternative is a zero-width lookahead
+# capturing one group, so a single finditer pass reports every position where any
+# pattern matches without one alternative consuming text another would match.
+_VERSION_RE = re.compile(
     # Common generic: "... version X.Y.Z"
-    re.compile(r"\bversion\b[:\s]*([0-9]+(?:\.[0-9]+){0,3}(?:[-_a-zA-Z0-9]+)?)", re.IGNORECASE),
+    r"(?=\bversion\b[:\s]*([0-9]+(?:\.[0-9]+){0,3}(?:[-_a-zA-Z0-9]+)?))"
     # Semver-ish standalone
-    re.compile(r"\b([0-9]+\.[0-9]+(?:\.[0-9]+){0,2}(?:[-+][\w\.-]+)?)\b"),
+    r"|(?=\b([0-9]+\.[0-9]+(?:\.[0-9]+){0,2}(?:[-+][\w\.-]+)?)\b)"
     # Packmol typical banner: "PACKMOL v20.15.3" or "PACKMOL 20.15.3"
-    re.compile(r"\bpackmol\b[\s:vV]*([0-9]+(?:\.[0-9]+){0,3})", re.IGNORECASE),
+    r"|(?=\bpackmol\b[\s:vV]*([0-9]+(?:\.[0-9]+){0,3}))"
     # msi2namd/msi2lmp patterns: "msi2lmp 1.0", "msi2namd v1.2.3"
-    re.compile(r"\bmsi2(?:lmp|namd)\b[\s:vV]*([0-9]+(?:\.[0-9]+){0,3})", re.IGNORECASE),
-]
+    r"|(?=\bmsi2(?:lmp|namd)\b[\s:vV]*([0-9]+(?:\.[0-9]+){0,3}))",
+    re.IGNORECASE,
+)
 
 
 def _parse_version_from_text(text: str) -> Optional[str]:
-    # Try each pattern; return first plausible match
-    for pat in _VERSION_PATTERNS:
-        m = pat.search(text or "")
-        if m:
-            ver = m.group(1).strip()
+    # Earliest match of the highest-priority pattern wins (group index == priority)
+    best: Optional[str] = None
+    best_rank = _VERSION_RE.groups + 1
+    for m in _VERSION_RE.finditer(text or ""):
+        rank = m.lastindex
+        if rank < best_rank:
+            ver = m.group(rank).strip()
             # Basic sanity: ensure at least one dot or digit sequence
             if any(ch.isdigit() for ch in ver):
-                return ver
-    return None
+                best, best_rank = ver, rank
+                if rank == 1:
+                    break
+    return best
 
 
 def get_tool_version(exe_path: str, timeout_s: int = 5) -> str:
@@ -133,37 +171,68 @@ def get_tool_version(exe_path: str, timeout_s: int = 5) -> str:
       3) Parse stdout/stderr with _parse_version_from_text
       4) Return "unknown" if all attempts fail or parse yields nothing
 
+    If --version and -version both ran and printed something unparseable, the
+    remaining probes are skipped (they rarely help). stdin is always /dev/null so
+    no probe can block waiting for terminal input.
+
     This function never raises; it is safe to call in summaries.
 
     NOTE: Probes are run in a temporary directory to prevent legacy tools
     (like msi2lmp) from creating spurious output files in the current
     working directory. Some tools interpret version flags as base names
     for output files (e.g., msi2lmp creates --version.data).
+
+    Parsed versions are memoized per (resolved path, mtime, size), so repeated
+    calls for the same executable do not re-spawn the probes while a rebuilt or
+    replaced binary is probed again. "unknown" is never memoized, so a probe
+    that timed out is retried on the next call.
     """
     try:
         exe = Path(exe_path).resolve()
-        if not exe.exists():
-            return "unknown"
+        st = exe.stat()
     except Exception:
         return "unknown"
+    key = (str(exe), st.st_mtime_ns, st.st_size)
+    ver = _tool_version_cache.get(key)
+    if ver is None:
+        ver = _probe_tool_version(str(exe), timeout_s)
+        if ver != "unknown":
+            if len(_tool_version_cache) >= _TOOL_VERSION_CACHE_MAX:
+                _tool_version_cache.clear()
+            _tool_version_cache[key] = ver
+    return ver
+
+
+# (resolved path, st_mtime_ns, st_size) -> parsed version string
+_tool_version_cache: Dict[Tuple[str, int, int], str] = {}
+_TOOL_VERSION_CACHE_MAX = 64
+
 
+def _probe_tool_version(exe_str: str, timeout_s: int) -> str:
+    """Run the version probes for get_tool_version."""
     attempts: List[List[str]] = [
-        [str(exe), "--version"],
-        [str(exe), "-version"],
-        [str(exe), "-v"],
-        [str(exe), "-h"],
-        [str(exe)],
+        [exe_str, "--version"],
+        [exe_str, "-version"],
+        [exe_str, "-v"],
+        [exe_str, "-h"],
+        [exe_str],
     ]
 
-    env = augment_env_with_exe_dir(str(exe))
+    # exe_str comes from get_tool_version already resolved
+    env = augment_env_with_exe_dir(exe_str, resolved=True)
 
     # Run probes in a temporary directory to avoid polluting the caller's cwd
     # with spurious output files from legacy tools (e.g., msi2lmp creates .data files)
     with tempfile.TemporaryDirectory(prefix="molsaic_version_probe_") as tmpdir:
-        for argv in attempts:
+        any_output = False
+        for n, argv in enumerate(attempts):
+            if n >= 2 and any_output:
+                # The tool answered the version flags without a parseable version
+                return "unknown"
             try:
                 proc = subprocess.run(
                     argv,
+                    stdin=subprocess.DEVNULL,
                     capture_output=True,
                     text=True,
                     timeout=timeout_s,
@@ -171,6 +240,7 @@ def get_tool_version(exe_path: str, timeout_s: int = 5) -> str:
                     cwd=tmpdir,  # Run in temp dir to contain any spurious files
                     check=False,
                 )
+                any_output = any_output or bool((proc.stdout or "").strip() or (proc.stderr or "").strip())
                 text = (proc.stdout or "") + "\n" + (proc.stderr or "")
                 ver = _parse_version_from_text(text)
                 if ver:
@@ -181,10 +251,11 @@ def get_tool_version(exe_path: str, timeout_s: int = 5) -> str:
 
         # As a final fallback, try invoking via shell if the path includes spaces (rare on Linux)
         try:
-            cmd = f"{shlex.quote(str(exe))} --version"
+            cmd = f"{shlex.quote(exe_str)} --version"
             proc = subprocess.run(
                 cmd,
                 shell=True,
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 timeout=timeout_s,
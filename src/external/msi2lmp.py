@@ -12,7 +12,7 @@ Contract compliance (v0.1.1):
   - Else derive from `output_prefix` parent
   - Else fall back to the CAR/MDF directory
 - Writes stdout/stderr to files in `work_dir` (`stdout.txt`, `stderr.txt`) and
-  includes the captured text in the envelope.
+  includes a bounded tail of the captured text in the envelope.
 - Validates expected outputs exist and are non-empty; computes sha256 for outputs.
 - Always writes `result.json` into `work_dir` for stable workspace manifests.
 - Missing tool behavior: if the executable is missing, do not raise; instead
@@ -32,17 +32,23 @@ Post-processing:
 from __future__ import annotations
 
 import logging
-import shutil
+import os
 import subprocess
 from pathlib import Path
 
 from .adapter import ExternalToolResult, get_tool_version
 
 # Import from private modules
-from ._msi2lmp_helpers import (
+from ._io import (
     ensure_file as _ensure_file,
+    is_regular_file as _is_regular_file,
     stage_file as _stage_file,
     sha256_file as _sha256_file,
+    sha256_files as _sha256_files,
+    write_and_hash as _write_and_hash,
+)
+from ._msi2lmp_helpers import (
+    tail_text as _tail_text,
     write_result_json as _write_result_json,
 )
 from ._msi2lmp_argv import (
@@ -50,12 +56,14 @@ from ._msi2lmp_argv import (
     build_msi2lmp_argv as _build_msi2lmp_argv,
     augment_env as _augment_env,
     run_command as _run,
+    read_log_tail as _read_log_tail,
 )
-from ._lmp_normalize import (
+from ._lmp_cell import (
     parse_abc_from_car as _parse_abc_from_car,
     parse_cell_from_car as _parse_cell_from_car,
-    normalize_data_file as _normalize_data_file,
+    is_triclinic as _is_triclinic,
 )
+from ._lmp_normalize import normalize_data_file as _normalize_data_file
 
 logger = logging.getLogger(__name__)
 
@@ -92,15 +100,19 @@ def run(
     - work_dir: optional explicit working directory to run within (deterministic)
 
     Returns:
-    - ExternalToolResult.to_dict() (plus back-compat alias 'lmp_data_file')
+    - ExternalToolResult.to_dict() (plus back-compat alias 'lmp_data_file'); 'stdout'/'stderr'
+      hold at most the last 4096 characters of each log ('stdout_truncated'/'stderr_truncated'
+      flag a cut), the full logs are 'stdout_file'/'stderr_file'
 
     Raises:
     - FileNotFoundError (inputs missing), RuntimeError (tool fails / output missing)
       NOTE: missing executable does NOT raise; returns status=missing_tool.
     """
+    # The executable is resolved (its real directory is prepended to PATH for the
+    # dynamic linker); the other paths only need to be absolute, which is lexical.
     exe = Path(exe_path).resolve()
 
-    base = Path(base_name).resolve()
+    base = Path(os.path.abspath(base_name))
     base_dir = base.parent
     base_stem = base.stem
 
@@ -109,14 +121,14 @@ def run(
     _ensure_file(src_car)
     _ensure_file(src_mdf)
 
-    frc_abs = Path(frc_file).resolve()
+    frc_abs = Path(os.path.abspath(frc_file))
     _ensure_file(frc_abs)
 
     # Deterministic workdir selection
     if work_dir:
-        wd = Path(work_dir).resolve()
+        wd = Path(os.path.abspath(work_dir))
     elif output_prefix:
-        wd = Path(output_prefix).resolve().parent
+        wd = Path(os.path.abspath(output_prefix)).parent
     else:
         wd = base_dir
     wd.mkdir(parents=True, exist_ok=True)
@@ -126,20 +138,23 @@ def run(
     stderr_path = wd / "stderr.txt"
 
     # Missing-tool behavior: create workdir + write result.json + return envelope without raising
-    if not exe.exists() or not exe.is_file():
+    if not _is_regular_file(exe):
         stderr_text = f"Executable not found: {exe}"
         stdout_text = ""
-        stdout_path.write_text(stdout_text, encoding="utf-8")
-        stderr_path.write_text(stderr_text + "\n", encoding="utf-8")
+        # Logs are hashed from memory as they are written (no read-back)
+        stdout_sha = _write_and_hash(stdout_path, stdout_text.encode("utf-8"))
+        stderr_sha = _write_and_hash(stderr_path, (stderr_text + "\n").encode("utf-8"))
 
         argv = [str(exe)]
+        stdout_tail, stdout_cut = _tail_text(stdout_text)
+        stderr_tail, stderr_cut = _tail_text(stderr_text)
         result = ExternalToolResult(
             tool="msi2lmp",
             argv=argv,
             cwd=str(wd),
             duration_s=0.0,
-            stdout=stdout_text,
-            stderr=stderr_text,
+            stdout=stdout_tail,
+            stderr=stderr_tail,
             outputs={
                 "stdout_file": str(stdout_path),
                 "stderr_file": str(stderr_path),
@@ -150,17 +165,17 @@ def run(
             warnings=[],
         )
         d = result.to_dict()
-        # Persist envelope deterministically
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
+        d["stdout_truncated"] = stdout_cut
+        d["stderr_truncated"] = stderr_cut
         d["outputs_sha256"] = {
             **d.get("outputs_sha256", {}),
-            "stdout_file": _sha256_file(stdout_path),
-            "stderr_file": _sha256_file(stderr_path),
+            "stdout_file": stdout_sha,
+            "stderr_file": stderr_sha,
         }
-        # Re-write so on-disk result.json matches the returned envelope
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
+        # Persist envelope deterministically; the result.json path is fixed, so record
+        # it first and write once so the on-disk file matches the returned envelope
+        d["outputs"]["result_json"] = str(wd / "result.json")
+        _write_result_json(wd, d)
         return d
 
     # Stage inputs into deterministic workdir so cwd is stable (and tool writes outputs there)
@@ -194,46 +209,33 @@ def run(
         ignore=bool(ignore),
         print_level=print_level,
     )
-    env = _augment_env(str(exe))
+    env = _augment_env(str(exe), resolved=True)
+    # Resolved once for every exit path below (memoized per executable identity)
+    tool_version = get_tool_version(str(exe))
 
     try:
-        duration, stdout, stderr = _run(cmd, cwd=wd, env=env, timeout_s=timeout_s)
+        # stdout/stderr go straight into stdout.txt/stderr.txt (also on failure/timeout)
+        duration, _, _ = _run(
+            cmd,
+            cwd=wd,
+            env=env,
+            timeout_s=timeout_s,
+            stdout_path=stdout_path,
+            stderr_path=stderr_path,
+        )
     except subprocess.TimeoutExpired as e:
-        # Persist stdout/stderr deterministically even on timeout so workspaces have diagnostics.
-        # Note: TimeoutExpired uses .stdout/.stderr on py3.11+; fall back to .output.
-        def _to_text(x) -> str:
-            if x is None:
-                return ""
-            if isinstance(x, bytes):
-                return x.decode("utf-8", errors="replace")
-            return str(x)
-
-        stdout_raw = None
-        stderr_raw = None
-        try:
-            stdout_raw = e.stdout if getattr(e, "stdout", None) is not None else getattr(e, "output", None)
-        except Exception:
-            stdout_raw = None
-        try:
-            stderr_raw = getattr(e, "stderr", None)
-        except Exception:
-            stderr_raw = None
-
-        stdout_text = _to_text(stdout_raw)
-        stderr_text = _to_text(stderr_raw)
-
-        stdout_path.write_text(stdout_text, encoding="utf-8")
-        stderr_path.write_text(stderr_text, encoding="utf-8")
+        # stdout.txt/stderr.txt already hold whatever the tool wrote before the timeout.
+        stdout_tail, stdout_cut = _read_log_tail(stdout_path)
+        stderr_tail, stderr_cut = _read_log_tail(stderr_path)
 
         # Write deterministic result.json for parity with missing-tool and ok paths.
-        tool_version = get_tool_version(str(exe))
         result = ExternalToolResult(
             tool="msi2lmp",
             argv=cmd,
             cwd=str(wd),
             duration_s=float(timeout_s),
-            stdout=stdout_text,
-            stderr=stderr_text,
+            stdout=stdout_tail,
+            stderr=stderr_tail,
             outputs={
                 "stdout_file": str(stdout_path),
                 "stderr_file": str(stderr_path),
@@ -247,31 +249,28 @@ def run(
             warnings=[f"timeout after {int(timeout_s)}s"],
         )
         d = result.to_dict()
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
-        # Re-write so on-disk result.json matches the returned envelope (including result_json path)
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
+        d["stdout_truncated"] = stdout_cut
+        d["stderr_truncated"] = stderr_cut
+        # Single write; the on-disk result.json includes its own (fixed) path
+        d["outputs"]["result_json"] = str(wd / "result.json")
+        _write_result_json(wd, d)
 
         raise RuntimeError(
             f"msi2lmp timed out after {timeout_s}s\n(see {stdout_path} and {stderr_path})"
         ) from e
     except subprocess.CalledProcessError as e:
-        # Persist stdout/stderr deterministically even on failure so workspaces have diagnostics.
-        stdout_text = e.stdout or ""
-        stderr_text = e.stderr or ""
-        stdout_path.write_text(stdout_text, encoding="utf-8")
-        stderr_path.write_text(stderr_text, encoding="utf-8")
+        # stdout.txt/stderr.txt already hold the tool's diagnostics for the workspace.
+        stdout_tail, stdout_cut = _read_log_tail(stdout_path)
+        stderr_tail, stderr_cut = _read_log_tail(stderr_path)
 
         # Also persist result.json for deterministic manifests/debugging.
-        tool_version = get_tool_version(str(exe))
         result = ExternalToolResult(
             tool="msi2lmp",
             argv=cmd,
             cwd=str(wd),
             duration_s=0.0,
-            stdout=stdout_text,
-            stderr=stderr_text,
+            stdout=stdout_tail,
+            stderr=stderr_tail,
             outputs={
                 "stdout_file": str(stdout_path),
                 "stderr_file": str(stderr_path),
@@ -285,23 +284,18 @@ def run(
             warnings=[f"exit_code={e.returncode}"],
         )
         d = result.to_dict()
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
-        result_json = _write_result_json(wd, d)
-        d["outputs"]["result_json"] = str(result_json)
+        d["stdout_truncated"] = stdout_cut
+        d["stderr_truncated"] = stderr_cut
+        d["outputs"]["result_json"] = str(wd / "result.json")
+        _write_result_json(wd, d)
 
         # Provide a concise error message but point to the persisted logs for full context.
-        msg = (stderr_text.strip() or stdout_text.strip() or str(e)).strip()
+        msg = (stderr_tail.strip() or stdout_tail.strip() or str(e)).strip()
         raise RuntimeError(
             f"msi2lmp failed with exit code {e.returncode}: {msg}\n"
             f"(see {stdout_path} and {stderr_path})"
         ) from e
 
-    stdout_text = stdout or ""
-    stderr_text = stderr or ""
-    stdout_path.write_text(stdout_text, encoding="utf-8")
-    stderr_path.write_text(stderr_text, encoding="utf-8")
-
     data_in = wd / f"{base_stem}.data"
     if not data_in.exists() or data_in.stat().st_size == 0:
         raise RuntimeError(f"Expected msi2lmp output not created or empty: {data_in}")
@@ -309,12 +303,10 @@ def run(
     # Determine output destination (always within workdir to keep artifacts colocated)
     data_out = wd / f"{out_name}.data"
 
-    # IMPORTANT: if out_name == base_stem, data_out == data_in.
-    # Do NOT unlink in that case, or we'd delete the freshly created output.
-    if data_in.resolve() != data_out.resolve():
-        if data_out.exists():
-            data_out.unlink()
-        shutil.move(str(data_in), str(data_out))
+    # IMPORTANT: if out_name == base_stem, data_out == data_in and nothing moves.
+    # Both live in wd, so a single atomic os.replace renames (clobbering any stale output).
+    if data_in != data_out:
+        os.replace(data_in, data_out)
 
     # Post-process header to match legacy behavior:
     # - Normalize XY header to [0,a]/[0,b] using CAR PBC values when requested.
@@ -339,45 +331,57 @@ def run(
         if alpha is not None and beta is not None and gamma is not None:
             cell_angles = (alpha, beta, gamma)
 
-        _normalize_data_file(
-            data_out,
-            a_dim,
-            b_dim,
-            bool(normalize_xy),
-            z_target,
-            do_z_shift,
-            do_z_center,
-            cell_angles=cell_angles,
-        )
-        logger.info(
-            "Applied post-msi2lmp normalization to LAMMPS .data (header; Z shift=%s; Z center=%s).",
-            bool(do_z_shift),
-            bool(do_z_center),
+        # Skip the .data scan entirely when no edit can result: no XY/Z header
+        # target, no atom Z shift/centering, and no triclinic tilt to write.
+        want_tilt = (
+            cell_angles is not None
+            and a_dim is not None
+            and b_dim is not None
+            and _is_triclinic(*cell_angles)
         )
+        if normalize_xy or z_target is not None or do_z_shift or do_z_center or want_tilt:
+            _normalize_data_file(
+                data_out,
+                a_dim,
+                b_dim,
+                bool(normalize_xy),
+                z_target,
+                do_z_shift,
+                do_z_center,
+                cell_angles=cell_angles,
+            )
+            logger.info(
+                "Applied post-msi2lmp normalization to LAMMPS .data (header; Z shift=%s; Z center=%s).",
+                bool(do_z_shift),
+                bool(do_z_center),
+            )
     except Exception as norm_err:
         logger.warning("Post-msi2lmp normalization failed: %s", norm_err)
 
     # Adapter-conformant result envelope with back-compat alias + deterministic artifacts
-    tool_version = get_tool_version(str(exe))
-
     outputs = {
         "lmp_data_file": str(data_out),
         "stdout_file": str(stdout_path),
         "stderr_file": str(stderr_path),
     }
-    outputs_sha256 = {
-        "lmp_data_file": _sha256_file(data_out),
-        "stdout_file": _sha256_file(stdout_path),
-        "stderr_file": _sha256_file(stderr_path),
-    }
+    outputs_sha256 = _sha256_files(
+        {
+            "lmp_data_file": data_out,
+            "stdout_file": stdout_path,
+            "stderr_file": stderr_path,
+        }
+    )
 
+    # Only the log tails are read back; the full logs stay in stdout.txt/stderr.txt
+    stdout_tail, stdout_cut = _read_log_tail(stdout_path)
+    stderr_tail, stderr_cut = _read_log_tail(stderr_path)
     result = ExternalToolResult(
         tool="msi2lmp",
         argv=cmd,
         cwd=str(wd),
         duration_s=float(duration),
-        stdout=stdout_text,
-        stderr=stderr_text,
+        stdout=stdout_tail,
+        stderr=stderr_tail,
         outputs=outputs,
         status="ok",
         outputs_sha256=outputs_sha256,
@@ -385,16 +389,15 @@ def run(
         warnings=[],
     )
     d = result.to_dict()
+    d["stdout_truncated"] = stdout_cut
+    d["stderr_truncated"] = stderr_cut
 
     # Preserve top-level alias for existing callers
     d["lmp_data_file"] = str(data_out)
 
-    # Persist deterministic result.json (and surface it in outputs)
-    result_json = _write_result_json(wd, d)
-    d["outputs"]["result_json"] = str(result_json)
-
-    # Re-write so on-disk result.json matches the returned envelope (including result_json path)
-    result_json = _write_result_json(wd, d)
-    d["outputs"]["result_json"] = str(result_json)
+    # Persist deterministic result.json (and surface it in outputs). The path is fixed,
+    # so it is recorded before the single write and the file matches the returned envelope.
+    d["outputs"]["result_json"] = str(wd / "result.json")
+    _write_result_json(wd, d)
 
     return d
@@ -7,12 +7,16 @@ PDB/PSF outputs.
 Determinism and assumptions:
 - Working directory is derived from the parent directory of 'output_prefix'.
 - Input CAR/MDF files are staged into the working directory if not already
-  present (copied when needed; identical-content files are not recopied).
+  present (reflinked or copied when needed; identical-content files are not recopied).
 - Forcefield parameter file (.prm) is referenced via absolute path (not copied).
 - The PATH is augmented so the dynamic linker can resolve adjacent libraries.
 - Execution enforces a timeout and raises on failure.
 - Outputs are validated (existence and non-empty).
 
+Concurrency:
+- run_async() is an awaitable variant for batching independent conversions
+  (distinct output_prefix directories) with asyncio.gather().
+
 Return value:
 - Dict with keys:
   - 'pdb_file': absolute path to the generated .pdb file
@@ -29,68 +33,41 @@ Exceptions:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import shutil
 import subprocess
 import time
 from pathlib import Path
-import filecmp
-from .adapter import ExternalToolResult, augment_env_with_exe_dir, get_tool_version
+from .adapter import ExternalToolResult, augment_env_with_exe_dir, decode_output, get_tool_version
+from ._io import ensure_file as _ensure_file, stage_file as _stage_file
 
 logger = logging.getLogger(__name__)
 
 
-def _augment_env(exe_path: str) -> dict:
+def _augment_env(exe_path: str, resolved: bool = False) -> dict:
     """Delegate to shared adapter helper for PATH augmentation."""
-    return augment_env_with_exe_dir(exe_path)
+    return augment_env_with_exe_dir(exe_path, resolved=resolved)
 
 
 def _run(cmd: list[str], cwd: Path, env: dict, timeout_s: int) -> tuple[float, str, str]:
     """Run a command with deterministic cwd/env/timeout. Raises CalledProcessError on nonzero exit."""
     t0 = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        cwd=str(cwd),
-        env=env,
-        capture_output=True,
-        text=True,
-        timeout=timeout_s,
-        check=True,
-    )
-    return (time.perf_counter() - t0, proc.stdout, proc.stderr)
-
-
-def _ensure_file(f: Path) -> None:
-    if not f.exists() or not f.is_file():
-        raise FileNotFoundError(f"File not found: {f}")
-
-
-def _stage_file(src_path: str, work_dir: Path) -> Path:
-    """Ensure a file is present in work_dir; copy only if needed; return destination path."""
-    src = Path(src_path).resolve()
-    _ensure_file(src)
-    work_dir.mkdir(parents=True, exist_ok=True)
-    dest = work_dir / src.name
-
-    # If already exactly the same path, nothing to do.
     try:
-        if src.resolve() == dest.resolve():
-            return dest
-    except Exception:
-        # Fallback to content comparison if resolution fails oddly
-        pass
-
-    if dest.exists():
-        try:
-            if filecmp.cmp(str(src), str(dest), shallow=False):
-                return dest
-        except Exception:
-            # If comparison fails, fall through to copying
-            pass
-
-    shutil.copy2(str(src), str(dest))
-    return dest
+        # Captured as bytes and decoded once (no incremental decoding while draining)
+        proc = subprocess.run(
+            cmd,
+            cwd=str(cwd),
+            env=env,
+            capture_output=True,
+            timeout=timeout_s,
+            check=True,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        e.stdout = decode_output(e.stdout)
+        e.stderr = decode_output(e.stderr)
+        raise
+    return (time.perf_counter() - t0, decode_output(proc.stdout), decode_output(proc.stderr))
 
 
 def run(
@@ -154,7 +131,7 @@ def run(
         name,
     ]
 
-    env = _augment_env(str(exe))
+    env = _augment_env(str(exe), resolved=True)
     try:
         duration, stdout, stderr = _run(cmd, cwd=work_dir, env=env, timeout_s=timeout_s)
     except subprocess.CalledProcessError as e:
@@ -188,3 +165,31 @@ def run(
     d["pdb_file"] = str(out_pdb)
     d["psf_file"] = str(out_psf)
     return d
+
+
+async def run_async(
+    mdf_file: str,
+    car_file: str,
+    prm_file: str,
+    residue: str,
+    output_prefix: str,
+    exe_path: str,
+    timeout_s: int = 600,
+) -> dict:
+    """Awaitable variant of run() for fanning out independent conversions.
+
+    Each call runs run() in a worker thread (the thread mostly waits on the
+    child process), so conversions with distinct output_prefix directories can
+    be batched with asyncio.gather(). Same parameters, return value and
+    exceptions as run().
+    """
+    return await asyncio.to_thread(
+        run,
+        mdf_file,
+        car_file,
+        prm_file,
+        residue,
+        output_prefix,
+        exe_path,
+        timeout_s,
+    )
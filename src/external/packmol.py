@@ -27,21 +27,91 @@ Exceptions:
 from __future__ import annotations
 
 import logging
-import re
+import os
 import subprocess
 import time
 from pathlib import Path
 from typing import Optional, List
 
-from .adapter import ExternalToolResult, augment_env_with_exe_dir, get_tool_version
+from .adapter import ExternalToolResult, augment_env_with_exe_dir, decode_output, get_tool_version
+from ._io import write_bytes as _write_bytes
 
 logger = logging.getLogger(__name__)
 
+
+def _is_seed_line(line: str) -> bool:
+    # "seed" as the first word (case-insensitive, followed by a non-word char or EOL)
+    s = line.lstrip()
+    if s[:4].lower() != "seed":
+        return False
+    return len(s) == 4 or not (s[4].isalnum() or s[4] == "_")
+
+
+def _directive_value(rest: str) -> str:
+    val = rest.strip().strip('\'"')
+    if val.endswith(";"):
+        val = val[:-1].strip()
+    return val
+
+
+def _scan_deck(deck_text: str, seed: int | None) -> tuple[str, Optional[str], List[str]]:
+    """Single pass over the deck: seed injection plus output/structure directives.
+
+    Returns (final deck text, first 'output' value, 'structure' values in order).
+    With a seed, existing seed lines are blanked (whitespace-only lines directly
+    above one collapse into it), leading newlines are dropped, and 'seed N' is
+    prepended; without one the text is returned unchanged.
+    """
+    out_name: Optional[str] = None
+    structure_files: List[str] = []
+    kept: List[str] = []
+    floor = 0  # kept[:floor] is settled; only later blank lines merge into a seed line
+
+    for raw_line in deck_text.split("\n"):
+        if seed is not None:
+            if _is_seed_line(raw_line):
+                while len(kept) > floor and (not kept[-1] or kept[-1].isspace()):
+                    kept.pop()
+                kept.append("")
+                floor = len(kept)
+                continue
+            kept.append(raw_line)
+
+        parts = raw_line.split("#", 1)[0].split(None, 1)
+        if len(parts) < 2:
+            continue
+        key = parts[0].lower()
+        if key == "output":
+            if out_name is None:
+                out_name = _directive_value(parts[1])
+        elif key == "structure":
+            structure_files.append(_directive_value(parts[1]))
+
+    if seed is not None:
+        deck_text = f"seed {seed}\n" + "\n".join(kept).lstrip("\n")
+    return deck_text, out_name, structure_files
+
+
 def _inject_seed(deck_text: str, seed: int) -> str:
     # Remove existing seed lines and insert a single deterministic seed at the top
-    seed_re = re.compile(r"^\s*seed\b.*$", re.IGNORECASE | re.MULTILINE)
-    pruned = seed_re.sub("", deck_text).lstrip("\n")
-    return f"seed {seed}\n{pruned}"
+    return _scan_deck(deck_text, seed)[0]
+
+
+def _is_plain_name(s: str) -> bool:
+    return bool(s) and s not in (".", "..") and os.sep not in s and (os.altsep is None or os.altsep not in s)
+
+
+def _existing_names(directory: Path) -> set[str] | None:
+    """Names in directory that exist (symlinks count only if their target does).
+
+    Returns None if the directory cannot be listed.
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {e.name for e in it if not e.is_symlink() or os.path.exists(e.path)}
+    except OSError:
+        return None
+
 
 def run(deck_path: str, exe_path: str, timeout_s: int = 600, seed: int | None = None, escalate_warnings_to_error: bool = False) -> dict:
     """Run Packmol by feeding the deck via a seekable stdin file handle.
@@ -69,62 +139,65 @@ def run(deck_path: str, exe_path: str, timeout_s: int = 600, seed: int | None =
 
     # Prepare working directory and deck text
     work_dir = Path.cwd()
-    deck_text = deck_p.read_text(encoding="utf-8")
-
-    if seed is not None:
-        deck_text = _inject_seed(deck_text, int(seed))
-
-    # Parse directives we care about from the final deck text
-    out_name: Optional[str] = None
-    structure_files: List[str] = []
-    out_re = re.compile(r"^\s*output\s+(.+?)\s*$", re.IGNORECASE)
-    struct_re = re.compile(r"^\s*structure\s+(.+?)\s*$", re.IGNORECASE)
-
-    for raw_line in deck_text.splitlines():
-        line_no_comment = raw_line.split("#", 1)[0].strip()
-        if not line_no_comment:
-            continue
-        m_out = out_re.match(line_no_comment)
-        if m_out and out_name is None:
-            val = m_out.group(1).strip().strip('\'"')
-            if val.endswith(";"):
-                val = val[:-1].strip()
-            out_name = val
-        m_struct = struct_re.match(line_no_comment)
-        if m_struct:
-            sval = m_struct.group(1).strip().strip('\'"')
-            if sval.endswith(";"):
-                sval = sval[:-1].strip()
-            structure_files.append(sval)
+    deck_text = deck_p.read_bytes().decode("utf-8")
+    # Universal newlines, as text-mode reading would apply
+    deck_is_lf = "\r" not in deck_text
+    if not deck_is_lf:
+        deck_text = deck_text.replace("\r\n", "\n").replace("\r", "\n")
+
+    # Seed injection and the directives we care about, in one pass over the deck
+    deck_text, out_name, structure_files = _scan_deck(
+        deck_text, int(seed) if seed is not None else None
+    )
 
     if not out_name:
         raise ValueError("Packmol deck missing output directive ('output <filename>')")
 
     # Prepare warnings for missing structure files (non-fatal unless escalated)
     warnings: List[str] = []
+    # Plain file names are checked against one listing of the working directory
+    # (instead of a stat each); anything with a directory part, a name missing from
+    # the listing, or a listing that failed falls back to a direct stat.
+    cwd_names = _existing_names(work_dir) if sum(map(_is_plain_name, structure_files)) > 1 else None
     for s in structure_files:
         s_path = (work_dir / s) if not Path(s).is_absolute() else Path(s)
-        if not s_path.exists():
+        found = cwd_names is not None and _is_plain_name(s) and s in cwd_names
+        if not found:
+            found = s_path.exists()
+        if not found:
             warnings.append(f"[packmol] Warning: structure file not found: {s_path}")
 
     if escalate_warnings_to_error and warnings:
         joined = "\n".join(warnings)
         raise RuntimeError(f"Packmol deck validation failed due to warnings escalation:\n{joined}")
 
-    # Write a temp copy of the deck into the working directory; pass as stdin (seekable file handle)
+    # Stage the deck into the working directory and pass it as stdin (seekable file handle).
+    # A deck that already lives there is fed as-is when unchanged (no rewrite); a modified
+    # (seeded or newline-normalized) copy of it goes to a private temp name instead of
+    # clobbering the user's file.
     tmp_deck = work_dir / (deck_p.name if deck_p.name else "packmol_deck.inp")
-    tmp_deck.write_text(deck_text, encoding="utf-8")
-
-    env = augment_env_with_exe_dir(str(exe))
+    cleanup_deck = False
+    try:
+        deck_in_work_dir = os.path.samefile(deck_p, tmp_deck)
+    except OSError:
+        deck_in_work_dir = False
+    if not deck_in_work_dir:
+        _write_bytes(tmp_deck, deck_text.encode("utf-8"))
+    elif seed is not None or not deck_is_lf:
+        tmp_deck = work_dir / f".packmol_deck.{os.getpid()}.inp"
+        cleanup_deck = True
+        _write_bytes(tmp_deck, deck_text.encode("utf-8"))
+
+    env = augment_env_with_exe_dir(str(exe), resolved=True)
     tool_version = get_tool_version(str(exe))
 
     t0 = time.perf_counter()
     try:
-        with tmp_deck.open("r", encoding="utf-8") as fh:
+        with tmp_deck.open("rb") as fh:
+            # Captured as bytes and decoded once (no incremental decoding while draining)
             proc = subprocess.run(
                 [str(exe)],
                 stdin=fh,
-                text=True,
                 capture_output=True,
                 check=True,
                 cwd=str(work_dir),
@@ -132,12 +205,18 @@ def run(deck_path: str, exe_path: str, timeout_s: int = 600, seed: int | None =
                 timeout=timeout_s,
             )
         duration = time.perf_counter() - t0
-        stdout = proc.stdout
-        stderr = proc.stderr
+        stdout = decode_output(proc.stdout)
+        stderr = decode_output(proc.stderr)
     except subprocess.CalledProcessError as e:
         duration = time.perf_counter() - t0
-        msg = e.stderr or e.stdout or str(e)
+        msg = decode_output(e.stderr) or decode_output(e.stdout) or str(e)
         raise RuntimeError(f"packmol failed with exit code {e.returncode}: {msg.strip()}") from e
+    finally:
+        if cleanup_deck:
+            try:
+                tmp_deck.unlink()
+            except OSError:
+                pass
 
     out_path = work_dir / out_name
     if not out_path.exists() or out_path.stat().st_size == 0:
@@ -2,20 +2,48 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
+import os
 import platform
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Mapping, Optional
 
 
-def sha256_file(path: str | Path, *, chunk_size: int = 1024 * 1024) -> str:
-    """Return hex-encoded sha256 for a file on disk."""
+_HAS_FILE_DIGEST = hasattr(hashlib, "file_digest")
+# Files at least this large are hashed through a read-only mmap (no copy into userspace)
+_MMAP_HASH_THRESHOLD = 16 * 1024 * 1024
+
+
+def sha256_file(path: str | Path, *, chunk_size: int = 4 * 1024 * 1024) -> str:
+    """Return hex-encoded sha256 for a file on disk.
+
+    Large files are fed to the hasher through a read-only mmap (sequential-access
+    hint); otherwise hashlib.file_digest (Python 3.11+: read/update loop in C) is
+    used when available, else readinto() on one reused chunk_size buffer. hashlib's sha256 is
+    OpenSSL-backed and picks up SHA-NI/ARMv8 SHA2 instructions where the CPU has them.
+    """
     p = Path(path)
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
+    with p.open("rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size >= _MMAP_HASH_THRESHOLD:
+            h = hashlib.sha256()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)
+            return h.hexdigest()
+        if _HAS_FILE_DIGEST:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
     return h.hexdigest()
 
 
@@ -28,7 +56,8 @@ def write_json_stable(path: str | Path, obj: Any) -> Path:
     """Write deterministic JSON (sorted keys + newline) to `path`."""
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json_dumps_stable(obj), encoding="utf-8")
+    # Encode once and write raw bytes (no text-layer encoder/newline translation)
+    p.write_bytes(json_dumps_stable(obj).encode("utf-8"))
     return p
 
 
@@ -61,11 +90,28 @@ def hash_paths(
 
     The returned `path` values are always relative to base_dir (POSIX style).
     """
-    out: dict[str, HashedPath] = {}
-    for key in sorted(paths.keys()):
-        p = Path(paths[key]).resolve()
-        out[key] = HashedPath(path=relpath_posix(p, base_dir=base_dir), sha256=sha256_file(p))
-    return out
+    keys = sorted(paths.keys())
+    # Each path (and base_dir) is resolved exactly once, as plain strings: realpath
+    # plus a prefix check instead of Path.resolve()/relative_to()/as_posix() per key
+    base_str = os.path.realpath(base_dir)
+    prefix = base_str if base_str.endswith(os.sep) else base_str + os.sep
+    resolved = [os.path.realpath(paths[key]) for key in keys]
+    # Relative paths first, so a path outside base_dir fails before any hashing
+    rels: list[str] = []
+    for p_str in resolved:
+        if p_str == base_str:
+            rels.append(".")
+        elif p_str.startswith(prefix):
+            rels.append(p_str[len(prefix):].replace(os.sep, "/"))
+        else:
+            raise ValueError(f"path is not under base_dir: path={p_str} base_dir={base_str}")
+    if len(resolved) <= 2:
+        digests = [sha256_file(p) for p in resolved]
+    else:
+        # hashlib releases the GIL while digesting, so files are hashed in parallel
+        with ThreadPoolExecutor(max_workers=min(8, len(resolved))) as ex:
+            digests = list(ex.map(sha256_file, resolved))
+    return {key: HashedPath(path=rel, sha256=digest) for key, rel, digest in zip(keys, rels, digests)}
 
 
 def get_python_version() -> str:
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+from collections import deque
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
@@ -41,28 +43,49 @@ def workspaces_root(repo_root: Optional[Path] = None) -> Path:
     return rr / "workspaces"
 
 
+_WORKSPACE_MARKERS = frozenset(("run.py", "config.json"))
+
+
 def _iter_workspace_dirs(root: Path) -> Iterable[Path]:
     """Yield candidate workspace directories beneath workspaces/.
 
     Rules:
     - A workspace is any directory that contains a run.py OR config.json.
-    - Excludes hidden directories and the _template directory by name.
+    - Excludes hidden directories and the _template directory by name (and
+      everything beneath them).
+    - A workspace's own subdirectories (outputs/, ...) are not searched:
+      workspaces do not nest.
+    - A symlinked directory is a workspace if its target holds a marker, but
+      is never descended into (as with the previous rglob walk).
+
+    Breadth-first os.scandir walk: every directory is listed exactly once and
+    both the workspace markers and the subdirectories to descend into are read
+    from that listing's cached dirent types (no per-candidate stat probes).
     """
-    if not root.exists():
-        return []
-
-    # Walk one level at a time (Path.rglob is fine here; workspaces is not huge).
-    for d in root.rglob("*"):
-        if not d.is_dir():
-            continue
-        name = d.name
-        if name.startswith("."):
+    root_str = os.fspath(root)
+    queue = deque([root_str])
+    while queue:
+        dir_path = queue.popleft()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
             continue
-        if name == "_template":
+        if dir_path != root_str and any(
+            e.name in _WORKSPACE_MARKERS and e.is_file() for e in entries
+        ):
+            yield Path(dir_path)
             continue
-
-        if (d / "run.py").is_file() or (d / "config.json").is_file():
-            yield d
+        for entry in entries:
+            name = entry.name
+            if name.startswith(".") or name == "_template":
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                queue.append(entry.path)
+            elif entry.is_symlink() and entry.is_dir() and any(
+                os.path.isfile(os.path.join(entry.path, m)) for m in _WORKSPACE_MARKERS
+            ):
+                yield Path(entry.path)
 
 
 @lru_cache(maxsize=1)
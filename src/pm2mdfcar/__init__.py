@@ -21,7 +21,9 @@ No external deps beyond the Python stdlib.
 from __future__ import annotations
 
 import csv as _csv
+import importlib as _importlib
 import json as _json
+import os as _os
 from pathlib import Path
 from typing import List
 
@@ -36,13 +38,6 @@ from ._parsers import (
     _parse_wat_templates,
 )
 
-# Re-export legacy pandas-based parsers
-from ._legacy_parsers import (
-    parse_car,
-    parse_mdf,
-    parse_pdb,
-)
-
 # Re-export formatters
 from ._formatters import (
     _format_car_atom,
@@ -53,19 +48,43 @@ from ._formatters import (
     _transform_connections_to_old,
 )
 
-# Re-export writers
-from ._writers import write_car, write_mdf
-
-# Re-export builders
-from ._builders import (
-    _legacy_build_car,
-    _legacy_build_mdf,
-    _legacy_load,
-    _legacy_parse_pdb,
-    build_combined_car,
-    build_combined_mdf,
-    load_mdf_templates,
-)
+# The pandas-based legacy parsers, writers and builders are re-exported lazily
+# (PEP 562): importing the package does not import pandas until one is used.
+_LAZY_EXPORTS = {
+    "parse_car": "._legacy_parsers",
+    "parse_mdf": "._legacy_parsers",
+    "parse_pdb": "._legacy_parsers",
+    "write_car": "._writers",
+    "write_mdf": "._writers",
+    "_legacy_build_car": "._builders",
+    "_legacy_build_mdf": "._builders",
+    "_legacy_load": "._builders",
+    "_legacy_parse_pdb": "._builders",
+    "build_combined_car": "._builders",
+    "build_combined_mdf": "._builders",
+    "load_mdf_templates": "._builders",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_importlib.import_module(module, __name__), name)
+    # Cache as a plain module attribute (later lookups, and monkeypatching, bypass this hook)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+def _export(name: str):
+    """Current module attribute `name` (a bare global lookup does not reach __getattr__)."""
+    g = globals()
+    return g[name] if name in g else __getattr__(name)
+
 
 # Re-export utilities from _models
 from ._models import (
@@ -120,6 +139,75 @@ __all__ = [
 ]
 
 
+def _list_file_names(directory: Path) -> set[str]:
+    """Return the names of regular files in `directory` (empty set if it is missing)."""
+    try:
+        with _os.scandir(directory) as it:
+            return {e.name for e in it if e.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _count_atoms_csv(atoms_csv: Path, resname_surface: str, resname_water: str) -> tuple[int, int, int]:
+    """Count (rows, surface-residue rows, water-residue rows) in the atoms CSV.
+
+    One streaming pass over the raw bytes with plain counters (no row dicts or
+    lists). The first non-blank line is a header when one of its fields is
+    'serial' or 'resname'; the residue name is then the (last) column named
+    exactly 'resname', else column 1. Lines containing quotes go through the csv module.
+    """
+    surf_b = resname_surface.upper().encode("utf-8")
+    water_b = {resname_water.upper().encode("utf-8"), b"HOH"}
+    total = surface = water = 0
+    col = None  # residue-name column; -1 when a header has no 'resname' column
+    with open(atoms_csv, "rb", buffering=1 << 20) as fh:
+        for raw in fh:
+            line = raw.strip()
+            if not line:
+                continue
+            if b'"' in line:
+                fields = [
+                    f.encode("utf-8")
+                    for f in next(_csv.reader([line.decode("utf-8")]))
+                ]
+            else:
+                fields = line.split(b",")
+            if col is None:
+                names = [f.strip().lower() for f in fields]
+                if b"serial" in names or b"resname" in names:
+                    # Rows are keyed by the verbatim header field (as csv.DictReader does)
+                    col = (len(fields) - 1 - fields[::-1].index(b"resname")) if b"resname" in fields else -1
+                    continue
+                col = 1
+            total += 1
+            if col < 0 or col >= len(fields):
+                continue
+            rn = fields[col].strip().upper()
+            if rn == surf_b:
+                surface += 1
+            if rn in water_b:
+                water += 1
+    return total, surface, water
+
+
+def _count_resnames(
+    resname_counts: dict, resname_surface: str, resname_water: str
+) -> tuple[int, int, int]:
+    """Count (atoms, surface-residue atoms, water-residue atoms) from per-resname
+    atom counts, matching the rules of _count_atoms_csv."""
+    surface_name = resname_surface.upper()
+    water_names = {resname_water.upper(), "HOH"}
+    total = surface = water = 0
+    for rn, n in resname_counts.items():
+        rn = rn.strip().upper()
+        total += n
+        if rn == surface_name:
+            surface += n
+        if rn in water_names:
+            water += n
+    return total, surface, water
+
+
 def build(
     hydrated_pdb: str,
     templates_dir: str,
@@ -153,18 +241,16 @@ def build(
     out_prefix = Path(output_prefix)
     out_prefix.parent.mkdir(parents=True, exist_ok=True)
 
-    # Load templates
+    # Load templates (one directory listing instead of a stat per expected file)
+    template_names = _list_file_names(templates_dir_path)
     as2_car = templates_dir_path / "AS2.car"
     as2_mdf = templates_dir_path / "AS2.mdf"
-    if not as2_car.exists():
+    if as2_car.name not in template_names:
         raise FileNotFoundError(f"AS2.car not found in {templates_dir_path}")
-    if not as2_mdf.exists():
+    if as2_mdf.name not in template_names:
         raise FileNotFoundError(f"AS2.mdf not found in {templates_dir_path}")
 
     as2_cell, as2_atoms, _ = _parse_car(as2_car)
-    # Override c
-    cell = dict(as2_cell)
-    cell["c"] = float(target_c)
 
     # AS2 bonds in template index space
     as2_bonds_templ = _parse_mdf_bonds(as2_mdf, as2_atoms)
@@ -174,9 +260,9 @@ def build(
 
     # Use a vendored legacy pm2mdfcar builder to reproduce MSI2LMP-compatible MDF/CAR
     # (kept for output compatibility/stability with existing pipelines).
-    pdb_atoms_df, residues_df, pdb_meta = _legacy_parse_pdb(pdb_path)
-    templates_legacy = _legacy_load(templates_dir_path)
-    _legacy_build_mdf(
+    pdb_atoms_df, residues_df, pdb_meta = _export("_legacy_parse_pdb")(pdb_path)
+    templates_legacy = _export("_legacy_load")(templates_dir_path)
+    mdf_result = _export("_legacy_build_mdf")(
         pdb_atoms_df,
         pdb_meta,
         templates_legacy,
@@ -184,83 +270,73 @@ def build(
         templates_dir_path,
         target_c=float(target_c),
     )
-    _legacy_build_car(pdb_atoms_df, pdb_meta, templates_legacy, out_prefix)
+    car_nbytes = _export("_legacy_build_car")(pdb_atoms_df, pdb_meta, templates_legacy, out_prefix)
+    if not isinstance(mdf_result, dict):
+        mdf_result = {}
+    box = mdf_result.get("box")
+    mdf_nbytes = mdf_result.get("nbytes")
 
+    # Sizes come from the builders; files are stat'ed only for builders that do not report them
     car_path = out_prefix.with_suffix(".car")
     mdf_path = out_prefix.with_suffix(".mdf")
-    if not car_path.exists() or car_path.stat().st_size == 0:
+    if car_nbytes is None:
+        car_nbytes = car_path.stat().st_size if car_path.exists() else 0
+    if mdf_nbytes is None:
+        mdf_nbytes = mdf_path.stat().st_size if mdf_path.exists() else 0
+    if not car_nbytes:
         raise RuntimeError(f"CAR write failed or empty: {car_path}")
-    if not mdf_path.exists() or mdf_path.stat().st_size == 0:
+    if not mdf_nbytes:
         raise RuntimeError(f"MDF write failed or empty: {mdf_path}")
 
-    # Cell from vendored meta (which already enforces c := target_c)
-    meta_path = out_prefix.parent / f"{out_prefix.name}_meta.json"
-    if meta_path.exists():
+    # Cell from the vendored builder's box, else the AS2 template cell; c is always target_c.
+    # Builders that do not return the box are read back from the meta JSON they emit.
+    if box is None:
+        meta_path = out_prefix.parent / f"{out_prefix.name}_meta.json"
+        if meta_path.exists():
+            try:
+                box = _json.loads(meta_path.read_text()).get("box")
+            except Exception:
+                pass
+    cell = None
+    if box:
         try:
-            meta = _json.loads(meta_path.read_text())
-            box = meta.get("box") or {}
-            if box:
-                cell = {
-                    "a": float(box.get("a", cell.get("a"))),
-                    "b": float(box.get("b", cell.get("b"))),
-                    "c": float(box.get("c", target_c)),
-                    "alpha": float(box.get("alpha", cell.get("alpha"))),
-                    "beta": float(box.get("beta", cell.get("beta"))),
-                    "gamma": float(box.get("gamma", cell.get("gamma"))),
-                }
+            cell = {
+                "a": float(box.get("a", as2_cell.get("a"))),
+                "b": float(box.get("b", as2_cell.get("b"))),
+                "c": float(target_c),
+                "alpha": float(box.get("alpha", as2_cell.get("alpha"))),
+                "beta": float(box.get("beta", as2_cell.get("beta"))),
+                "gamma": float(box.get("gamma", as2_cell.get("gamma"))),
+            }
         except Exception:
             pass
-
-    # Counts via CSV emitted by vendored builder
-    atoms_csv = out_prefix.parent / f"{out_prefix.name}_atoms.csv"
+    if cell is None:
+        cell = {
+            "a": as2_cell["a"],
+            "b": as2_cell["b"],
+            "c": float(target_c),
+            "alpha": as2_cell["alpha"],
+            "beta": as2_cell["beta"],
+            "gamma": as2_cell["gamma"],
+        }
+
+    # Counts from the builder's per-residue atom counts; builders that do not report
+    # them are counted from the atoms CSV they emit.
+    resname_counts = mdf_result.get("resname_counts")
     total_atoms = 0
     surface_atoms_count = 0
-    waters_count = 0
-    if atoms_csv.exists():
-        # Robust CSV handling: support files with or without header row
-        text = atoms_csv.read_text(encoding="utf-8")
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        if lines:
-            header_tokens = [tok.strip().lower() for tok in lines[0].split(",")]
-            has_header = ("serial" in header_tokens) or ("resname" in header_tokens)
-            if has_header:
-                reader = _csv.DictReader(lines)
-                rows = list(reader)
-                total_atoms = len(rows)
-                surface_atoms_count = sum(
-                    1
-                    for r in rows
-                    if (str(r.get("resname", "")).strip().upper() == resname_surface.upper())
-                )
-                water_atoms = sum(
-                    1
-                    for r in rows
-                    if (
-                        str(r.get("resname", "")).strip().upper()
-                        in {resname_water.upper(), "HOH"}
-                    )
-                )
-                waters_count = water_atoms // 3
-            else:
-                reader = _csv.reader(lines)
-                data_rows = list(reader)
-                total_atoms = len(data_rows)
-
-                def _tok(row, idx):
-                    try:
-                        return str(row[idx]).strip().upper()
-                    except Exception:
-                        return ""
-
-                surface_atoms_count = sum(
-                    1 for row in data_rows if _tok(row, 1) == resname_surface.upper()
-                )
-                water_atoms = sum(
-                    1
-                    for row in data_rows
-                    if _tok(row, 1) in {resname_water.upper(), "HOH"}
-                )
-                waters_count = water_atoms // 3
+    water_atoms = 0
+    if resname_counts is not None:
+        total_atoms, surface_atoms_count, water_atoms = _count_resnames(
+            resname_counts, resname_surface, resname_water
+        )
+    else:
+        atoms_csv = out_prefix.parent / f"{out_prefix.name}_atoms.csv"
+        if atoms_csv.exists():
+            total_atoms, surface_atoms_count, water_atoms = _count_atoms_csv(
+                atoms_csv, resname_surface, resname_water
+            )
+    waters_count = water_atoms // 3
 
     bonds_count = len(as2_bonds_templ) + waters_count * len(wat_bonds_tpl)
 
@@ -273,13 +349,6 @@ def build(
             "waters": waters_count,
             "surface_atoms": surface_atoms_count,
         },
-        "cell": {
-            "a": cell["a"],
-            "b": cell["b"],
-            "c": float(target_c),
-            "alpha": cell["alpha"],
-            "beta": cell["beta"],
-            "gamma": cell["gamma"],
-        },
+        "cell": cell,
         "warnings": warnings,
     }
@@ -7,8 +7,10 @@ produce MSI2LMP-compatible output files.
 from __future__ import annotations
 
 import json as _json
+import os as _os
 import re as _re
 from collections import defaultdict as _defaultdict
+from functools import lru_cache as _lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -61,7 +63,7 @@ def build_combined_mdf(
     templates_dir: Path,
     target_c: float | None = None,
     z_pad: float = 0.5,
-) -> None:
+) -> dict:
     """Build a combined MDF file from PDB atoms and templates.
 
     This function processes PDB atoms, maps them to templates,
@@ -75,6 +77,11 @@ def build_combined_mdf(
         templates_dir: Directory containing template CAR files
         target_c: Target c cell dimension (optional)
         z_pad: Padding for z coordinate calculation
+
+    Returns:
+        Dict with "box" (the PBC box written to the meta JSON: a, b, c, alpha,
+        beta, gamma; empty when none could be determined), "nbytes" (size
+        of the written MDF file) and "resname_counts" (atoms per residue name)
     """
     output_dir = output_prefix.parent
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -244,17 +251,20 @@ def build_combined_mdf(
                 str(r).strip().upper()
                 for r in pdb_atoms.get("resName", _pd.Series(dtype=str)).unique()
             )
+            # One directory listing serves both the per-residue lookup and the fallback
+            with _os.scandir(templates_dir) as it:
+                car_names = [e.name for e in it if e.name.endswith(".car")]
+            car_name_set = set(car_names)
             candidates = []
             for stem in resnames:
                 if stem == "WAT" or stem == "":
                     continue
-                candidate = templates_dir / f"{stem}.car"
-                if candidate.exists():
-                    candidates.append(candidate)
+                if f"{stem}.car" in car_name_set:
+                    candidates.append(templates_dir / f"{stem}.car")
             if not candidates:
-                for p in templates_dir.glob("*.car"):
-                    if p.stem.strip().upper() != "WAT":
-                        candidates.append(p)
+                for name in car_names:
+                    if name[:-4].strip().upper() != "WAT":
+                        candidates.append(templates_dir / name)
             if not candidates:
                 raise FileNotFoundError(f"No slab template .car found in {templates_dir}")
 
@@ -360,7 +370,21 @@ def build_combined_mdf(
         _json.dumps(combined_meta, indent=2)
     )
 
-    write_mdf(str(output_prefix))
+    nbytes = write_mdf(str(output_prefix))
+    return {
+        "box": combined_meta["box"],
+        "nbytes": nbytes,
+        "resname_counts": _resname_counts(combined_atoms),
+    }
+
+
+def _resname_counts(atoms_df: _pd.DataFrame) -> Dict[str, int]:
+    """Atoms per residue name; missing names count under "" (every row is counted)."""
+    counts: Dict[str, int] = {}
+    for k, v in atoms_df["resname"].value_counts(sort=False, dropna=False).items():
+        key = "" if _pd.isna(k) else str(k)
+        counts[key] = counts.get(key, 0) + int(v)
+    return counts
 
 
 def build_combined_car(
@@ -368,7 +392,7 @@ def build_combined_car(
     pdb_meta: dict,
     templates: Dict[str, Tuple[_pd.DataFrame, dict]],
     output_prefix: Path,
-) -> None:
+) -> int:
     """Build a combined CAR file from intermediate data.
 
     Requires that build_combined_mdf has been run first to produce
@@ -379,6 +403,9 @@ def build_combined_car(
         pdb_meta: Metadata from PDB parsing (not directly used)
         templates: Dict of template DataFrames by residue name (not directly used)
         output_prefix: Path prefix for output files
+
+    Returns:
+        Number of bytes written to the CAR file
     """
     input_dir = output_prefix.parent
     atoms_parq = input_dir / f"{output_prefix.name}_atoms.parquet"
@@ -386,7 +413,7 @@ def build_combined_car(
     meta_json = input_dir / f"{output_prefix.name}_meta.json"
     if (not meta_json.exists()) or (not atoms_parq.exists() and not atoms_csv.exists()):
         raise SystemExit("Error: expected intermediate files missing prior to CAR build.")
-    write_car(output_prefix)
+    return write_car(output_prefix)
 
 
 # Convenience wrappers matching names used in pm2mdfcar.build()
@@ -395,9 +422,38 @@ def _legacy_parse_pdb(p: Path):
     return parse_pdb(p)
 
 
+def _mdf_templates_signature(template_dir: Path) -> Tuple[Tuple[str, int, int], ...] | None:
+    """(name, mtime_ns, size) of every .mdf in template_dir, or None if it cannot be listed."""
+    try:
+        with _os.scandir(template_dir) as it:
+            return tuple(
+                sorted(
+                    (e.name, st.st_mtime_ns, st.st_size)
+                    for e in it
+                    if e.name.lower().endswith(".mdf")
+                    for st in (e.stat(),)
+                )
+            )
+    except OSError:
+        return None
+
+
+@_lru_cache(maxsize=8)
+def _load_mdf_templates_cached(template_dir: str, _signature) -> Dict[str, Tuple[_pd.DataFrame, dict]]:
+    # _signature only keys the cache: any added/removed/rewritten template misses it
+    return load_mdf_templates(Path(template_dir))
+
+
 def _legacy_load(p: Path):
-    """Legacy wrapper for load_mdf_templates."""
-    return load_mdf_templates(p)
+    """Legacy wrapper for load_mdf_templates.
+
+    Parsed templates are cached per directory and reused while no .mdf file in
+    it has been added, removed or modified (builders only read them).
+    """
+    signature = _mdf_templates_signature(p)
+    if signature is None:
+        return load_mdf_templates(p)
+    return dict(_load_mdf_templates_cached(str(p), signature))
 
 
 def _legacy_build_mdf(
@@ -408,7 +464,7 @@ def _legacy_build_mdf(
     tpl_dir: Path,
     target_c: float | None = None,
 ):
-    """Legacy wrapper for build_combined_mdf."""
+    """Legacy wrapper for build_combined_mdf (returns its result dict)."""
     return build_combined_mdf(a, m, t, out, tpl_dir, target_c=target_c)
 
 
@@ -22,13 +22,36 @@ __all__ = [
 ]
 
 
+# parse_pdb atom columns, in output order
+_PDB_ATOM_COLUMNS = (
+    "record_type",
+    "serial",
+    "name",
+    "altLoc",
+    "resName",
+    "chainID",
+    "resSeq",
+    "iCode",
+    "x",
+    "y",
+    "z",
+    "occupancy",
+    "tempFactor",
+    "element",
+    "charge",
+)
+
+
 def parse_pdb(pdb_path: Path) -> Tuple[_pd.DataFrame, _pd.DataFrame, dict]:
     """Parse a PDB file using pandas.
 
+    ATOM/HETATM fields are collected as plain tuples (no per-atom dict) and
+    handed to pandas in a single DataFrame construction.
+
     Returns:
         Tuple of (atoms_df, residues_df, meta dict)
     """
-    atoms = []
+    rows: List[Tuple[Any, ...]] = []
     meta: dict = {"source_file": str(pdb_path)}
     with pdb_path.open("r", errors="replace") as handle:
         for line in handle:
@@ -48,32 +71,31 @@ def parse_pdb(pdb_path: Path) -> Tuple[_pd.DataFrame, _pd.DataFrame, dict]:
                     logging.warning("Could not parse CRYST1 line.")
             elif line.startswith("ATOM") or line.startswith("HETATM"):
                 try:
-                    record = {
-                        "record_type": line[0:6].strip(),
-                        "serial": int(line[6:11]),
-                        "name": line[12:16].strip(),
-                        "altLoc": line[16:17].strip(),
-                        "resName": line[17:21].strip(),
-                        "chainID": line[21:22].strip(),
-                        "resSeq": int(line[22:26]),
-                        "iCode": line[26:27].strip(),
-                        "x": float(line[30:38]),
-                        "y": float(line[38:46]),
-                        "z": float(line[46:54]),
-                        "occupancy": float(line[54:60]),
-                        "tempFactor": float(line[60:66]),
-                        "element": line[76:78].strip(),
-                        "charge": line[78:80].strip(),
-                    }
-                    atoms.append(record)
+                    rows.append((
+                        line[0:6].strip(),
+                        int(line[6:11]),
+                        line[12:16].strip(),
+                        line[16:17].strip(),
+                        line[17:21].strip(),
+                        line[21:22].strip(),
+                        int(line[22:26]),
+                        line[26:27].strip(),
+                        float(line[30:38]),
+                        float(line[38:46]),
+                        float(line[46:54]),
+                        float(line[54:60]),
+                        float(line[60:66]),
+                        line[76:78].strip(),
+                        line[78:80].strip(),
+                    ))
                 except (ValueError, IndexError):
-                    logging.warning(f"Skipping malformed ATOM/HETATM line: {line.strip()}")
+                    logging.warning("Skipping malformed ATOM/HETATM line: %s", line.strip())
                     continue
 
-    if not atoms:
+    if not rows:
         raise ValueError("No ATOM or HETATM records found in the PDB file.")
 
-    atoms_df = _pd.DataFrame(atoms)
+    atoms_df = _pd.DataFrame(rows, columns=list(_PDB_ATOM_COLUMNS))
     residues_df = (
         atoms_df[["chainID", "resSeq", "resName"]]
         .drop_duplicates()
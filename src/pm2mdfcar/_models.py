@@ -11,9 +11,7 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
-
-import pandas as _pd
+from typing import Iterator, List
 
 logger = logging.getLogger(__name__)
 
@@ -61,9 +59,16 @@ ATOM_COLUMN_NAMES = [
 ]
 
 
+def _iter_lines(path: Path) -> Iterator[str]:
+    """Yield a text file's lines (without line endings), one buffered line at a time."""
+    with path.open("r") as fh:
+        for ln in fh:
+            yield ln.rstrip("\r\n")
+
+
 def _read_text(path: Path) -> List[str]:
     """Read a text file and return its lines."""
-    return path.read_text().splitlines()
+    return list(_iter_lines(path))
 
 
 def _normalize_name(name: str) -> str:
@@ -107,6 +112,10 @@ def _format_numeric_or_question(
     """
     if value is None:
         return default_val
+    # Imported here so that importing the package does not pull in pandas; only the
+    # legacy writers call this, and they have already imported it.
+    import pandas as _pd
+
     try:
         if _pd.isna(value):
             return default_val
@@ -13,7 +13,7 @@ from typing import Dict, List, Sequence, Tuple
 from ._models import (
     PDBAtom,
     TemplateAtom,
-    _read_text,
+    _iter_lines,
     logger,
 )
 
@@ -24,6 +24,17 @@ __all__ = [
     "_parse_pdb",
 ]
 
+# Compiled once; these run per line in the template parse loops
+_CAR_PBC_RE = _re.compile(
+    r"^PBC\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+"
+    r"([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)"
+)
+_MDF_NAME_RE = _re.compile(r"^XXXX_(\d+):([A-Za-z0-9_]+)$")
+_RESSEQ_RE = _re.compile(r"(-?\d+)")
+_ALPHA_RE = _re.compile(r"[A-Za-z]")
+# MDF comment/section/directive prefixes
+_MDF_SKIP_CHARS = frozenset("!#@")
+
 
 def _parse_car(
     car_path: Path,
@@ -41,19 +52,14 @@ def _parse_car(
     """
     if not car_path.exists():
         raise FileNotFoundError(f"Template CAR not found: {car_path}")
-    lines = _read_text(car_path)
 
     # Parse PBC
     cell = None
-    pbc_re = _re.compile(
-        r"^PBC\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+"
-        r"([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)\s+([+-]?\d+(?:\.\d+)?)"
-    )
 
     header_lines: List[str] = []
     atoms: List[TemplateAtom] = []
 
-    for ln in lines:
+    for ln in _iter_lines(car_path):
         s = ln.strip()
         if not s:
             continue
@@ -64,7 +70,7 @@ def _parse_car(
             # keep it but we will write our own PBC line later
             header_lines.append(ln)
             continue
-        m = pbc_re.match(s)
+        m = _CAR_PBC_RE.match(s)
         if m:
             a, b, c, alpha, beta, gamma = map(float, m.groups())
             cell = {
@@ -130,11 +136,10 @@ def _parse_mdf_bonds(
     }
 
     bonds_set: set[Tuple[int, int]] = set()
-    name_re = _re.compile(r"^XXXX_(\d+):([A-Za-z0-9_]+)$")
 
-    for ln in _read_text(mdf_path):
+    for ln in _iter_lines(mdf_path):
         s = ln.strip()
-        if not s or s.startswith("!") or s.startswith("#") or s.startswith("@"):
+        if not s or s[0] in _MDF_SKIP_CHARS:
             continue
 
         # Expect first token like: XXXX_23:Al1
@@ -142,7 +147,7 @@ def _parse_mdf_bonds(
         if not toks:
             continue
         head = toks[0]
-        m = name_re.match(head)
+        m = _MDF_NAME_RE.match(head)
         if not m:
             continue
 
@@ -165,7 +170,7 @@ def _parse_mdf_bonds(
         for ct in conn_toks:
             # connections may be "Label" (same residue) or "XXXX_n:Label"
             if ":" in ct:
-                mm = name_re.match(ct)
+                mm = _MDF_NAME_RE.match(ct)
                 if not mm:
                     continue
                 res2 = int(mm.group(1))
@@ -202,7 +207,7 @@ def _parse_wat_templates(
 
     # Parse WAT.car atom types, elements, charges (tolerate PBC=OFF with no numeric PBC line)
     wat_atoms_raw: List[TemplateAtom] = []
-    for ln in _read_text(wat_car):
+    for ln in _iter_lines(wat_car):
         s = ln.strip()
         if not s or s.startswith("!") or s.lower() == "end" or s.upper().startswith("PBC"):
             continue
@@ -240,18 +245,17 @@ def _parse_wat_templates(
     # Parse bonds from WAT.mdf using local molecule (res=1)
     # Build mapping for XXXX_1:Label -> index in 'ordered'
     addr_to_idx: Dict[Tuple[int, str], int] = {(1, "O1"): 0, (1, "H1"): 1, (1, "H2"): 2}
-    name_re = _re.compile(r"^XXXX_(\d+):([A-Za-z0-9_]+)$")
     bonds_set: set[Tuple[int, int]] = set()
 
-    for ln in _read_text(wat_mdf):
+    for ln in _iter_lines(wat_mdf):
         s = ln.strip()
-        if not s or s.startswith("!") or s.startswith("#") or s.startswith("@"):
+        if not s or s[0] in _MDF_SKIP_CHARS:
             continue
         toks = s.split()
         if not toks:
             continue
         head = toks[0]
-        m = name_re.match(head)
+        m = _MDF_NAME_RE.match(head)
         if not m:
             continue
         try:
@@ -266,7 +270,7 @@ def _parse_wat_templates(
         conn_toks = toks[12:] if len(toks) > 12 else []
         for ct in conn_toks:
             if ":" in ct:
-                mm = name_re.match(ct)
+                mm = _MDF_NAME_RE.match(ct)
                 if not mm:
                     continue
                 res2 = int(mm.group(1))
@@ -292,7 +296,7 @@ def _parse_pdb(pdb_path: Path) -> List[PDBAtom]:
         raise FileNotFoundError(f"PDB not found: {pdb_path}")
 
     atoms: List[PDBAtom] = []
-    for ln in _read_text(pdb_path):
+    for ln in _iter_lines(pdb_path):
         if not (ln.startswith("ATOM") or ln.startswith("HETATM")):
             continue
         # Fixed columns per PDB spec
@@ -305,7 +309,7 @@ def _parse_pdb(pdb_path: Path) -> List[PDBAtom]:
         chain = ln[21:22].strip()
         resseq_str = ln[22:26].strip()
         try:
-            resseq = int(_re.match(r"(-?\d+)", resseq_str).group(1)) if resseq_str else 0
+            resseq = int(_RESSEQ_RE.match(resseq_str).group(1)) if resseq_str else 0
         except Exception:
             resseq = 0
         try:
@@ -326,7 +330,7 @@ def _parse_pdb(pdb_path: Path) -> List[PDBAtom]:
         element = ln[76:78].strip() if len(ln) >= 78 else ""
         if not element:
             # Infer element from atom name's first alpha char
-            m = _re.search(r"[A-Za-z]", name)
+            m = _ALPHA_RE.search(name)
             element = (m.group(0).upper() if m else "").title()
         atoms.append(
             PDBAtom(serial, name, resname, chain, resseq, x, y, z, element.title())
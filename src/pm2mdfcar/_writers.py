@@ -20,6 +20,20 @@ __all__ = [
     "write_car",
 ]
 
+# CAR label parsing patterns, compiled once (write_car runs them per atom row).
+# Labels allow ion-like names (na+, cl-) in the label/name field.
+_CAR_NAME = r"[A-Za-z0-9_+\-]+"
+_FULL_LABEL_RES = (
+    (_re.compile(rf"^XXXX_\d+:({_CAR_NAME})$"), 1),
+    (_re.compile(rf"^MOL_\d+:(XXXX_\d+)_({_CAR_NAME})$"), 2),
+    (_re.compile(rf"^(XXXX_\d+)_({_CAR_NAME})$"), 2),
+)
+_ATOM_ID_RES = (
+    _re.compile(r"^(XXXX_\d+):"),
+    _re.compile(r"^MOL_\d+:(XXXX_\d+)_"),
+    _re.compile(r"^(XXXX_\d+)_"),
+)
+
 
 def write_mdf(prefix, output_mdf=None):
     """Write an MDF file from intermediate files.
@@ -30,6 +44,9 @@ def write_mdf(prefix, output_mdf=None):
     Args:
         prefix: Path prefix for intermediate files
         output_mdf: Optional output path; defaults to {prefix}.mdf
+
+    Returns:
+        Number of bytes written to the MDF file
     """
     atoms_file_parquet = f"{prefix}_atoms.parquet"
     atoms_file_csv = f"{prefix}_atoms.csv"
@@ -151,6 +168,7 @@ def write_mdf(prefix, output_mdf=None):
 
         f.write("\n!\n")
         f.write("#end\n")
+        return f.tell()
 
 
 def write_car(prefix_path: Path, output_car_path: Path = None):
@@ -162,6 +180,9 @@ def write_car(prefix_path: Path, output_car_path: Path = None):
     Args:
         prefix_path: Path prefix for intermediate files
         output_car_path: Optional output path; defaults to {prefix}.car
+
+    Returns:
+        Number of bytes written to the CAR file
     """
     input_dir = prefix_path.parent
     file_stem = prefix_path.name
@@ -277,36 +298,22 @@ def write_car(prefix_path: Path, output_car_path: Path = None):
             charge = row.get("charge")
 
             base_label = None
-            # allow ion-like labels (na+, cl-) in the label/name field
-            name_re = r"[A-Za-z0-9_+\-]+"
-            m = _re.match(rf"^XXXX_\d+:({name_re})$", full)
-            if m:
-                base_label = m.group(1)
-            if base_label is None:
-                m = _re.match(rf"^MOL_\d+:(XXXX_\d+)_({name_re})$", full)
+            for pat, group in _FULL_LABEL_RES:
+                m = pat.match(full)
                 if m:
-                    base_label = m.group(2)
-            if base_label is None:
-                m = _re.match(rf"^(XXXX_\d+)_({name_re})$", full)
-                if m:
-                    base_label = m.group(2)
+                    base_label = m.group(group)
+                    break
             if base_label is None:
                 base_label = str(
                     row.get("label") or row.get("car_label") or row.get("element") or ""
                 )
 
             atom_id = ""
-            m = _re.match(r"^(XXXX_\d+):", full)
-            if m:
-                atom_id = m.group(1)
-            else:
-                m = _re.match(r"^MOL_\d+:(XXXX_\d+)_", full)
+            for pat in _ATOM_ID_RES:
+                m = pat.match(full)
                 if m:
                     atom_id = m.group(1)
-                else:
-                    m = _re.match(r"^(XXXX_\d+)_", full)
-                    if m:
-                        atom_id = m.group(1)
+                    break
             atom_id_str = f"{atom_id.replace('_', ' '):<12}" if atom_id else " " * 12
 
             label_str = f"{base_label:<9}"
@@ -329,3 +336,4 @@ def write_car(prefix_path: Path, output_car_path: Path = None):
         else:
             f.write("end\n")
             f.write("end\n")
+        return f.tell()
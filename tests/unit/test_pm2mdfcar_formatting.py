@@ -113,4 +113,60 @@ def test_build_writes_car_mdf_and_honors_target_c(tmp_path: Path, monkeypatch):
     assert "atoms" in counts and "surface_atoms" in counts and "waters" in counts and "bonds" in counts
     assert counts["atoms"] == 14
     assert counts["surface_atoms"] == 8
-    assert counts["waters"] == 2
\ No newline at end of file
+    assert counts["waters"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("report_counts", [True, False])
+def test_build_counts_atoms_with_missing_resname(tmp_path: Path, monkeypatch, report_counts: bool):
+    """
+    build() counts atoms with a blank/missing resname the same way whether the
+    builder reports per-resname counts or they are read from its atoms CSV.
+    """
+    pd = pytest.importorskip("pandas")
+    from pm2mdfcar._builders import _resname_counts
+
+    resnames = ["AS2"] * 4 + ["WAT"] * 3 + [None, ""] + ["HOH"] * 3 + ["NA"]
+    atoms = pd.DataFrame({"serial": range(1, len(resnames) + 1), "resname": resnames})
+
+    templates_dir = tmp_path / "templates"
+    templates_dir.mkdir()
+    for name in ("AS2.car", "AS2.mdf"):
+        (templates_dir / name).write_text("! stub\n", encoding="utf-8")
+    hydrated_pdb = tmp_path / "hydrated.pdb"
+    hydrated_pdb.write_text("REMARK stub\n", encoding="utf-8")
+
+    def fake_legacy_build_mdf(_df, _meta, _templates, out_prefix_path: Path, _templ_dir: Path, target_c: float):
+        out_prefix_path.parent.mkdir(parents=True, exist_ok=True)
+        atoms.to_csv(out_prefix_path.parent / f"{out_prefix_path.name}_atoms.csv", index=False)
+        out_prefix_path.with_suffix(".mdf").write_text("# MDF stub\n", encoding="utf-8")
+        if not report_counts:
+            return None
+        # What build_combined_mdf reports for its combined atoms table
+        return {"box": {"a": 1.0, "b": 1.0, "c": target_c}, "resname_counts": _resname_counts(atoms)}
+
+    def fake_legacy_build_car(_df, _meta, _templates, out_prefix_path: Path):
+        out_prefix_path.with_suffix(".car").write_text("! CAR stub\n", encoding="utf-8")
+
+    cell = {"a": 1.0, "b": 1.0, "c": 1.0, "alpha": 90.0, "beta": 90.0, "gamma": 90.0}
+    monkeypatch.setattr(pm2mdfcar, "_parse_car", lambda _p: (cell, [], []))
+    monkeypatch.setattr(pm2mdfcar, "_parse_mdf_bonds", lambda _p, _a: [])
+    monkeypatch.setattr(pm2mdfcar, "_parse_wat_templates", lambda _d: ([], []))
+    monkeypatch.setattr(pm2mdfcar, "_legacy_parse_pdb", lambda _p: (object(), object(), {}))
+    monkeypatch.setattr(pm2mdfcar, "_legacy_build_mdf", fake_legacy_build_mdf)
+    monkeypatch.setattr(pm2mdfcar, "_legacy_build_car", fake_legacy_build_car)
+    monkeypatch.setattr(pm2mdfcar, "_legacy_load", lambda _d: {})
+
+    res = pm2mdfcar.build(
+        hydrated_pdb=str(hydrated_pdb),
+        templates_dir=str(templates_dir),
+        output_prefix=str(tmp_path / "converted" / "ASX_hydrated"),
+        target_c=10.0,
+        resname_surface="AS2",
+        resname_water="WAT",
+    )
+
+    counts = res["counts"]
+    assert counts["atoms"] == len(resnames)
+    assert counts["surface_atoms"] == 4
+    assert counts["waters"] == 2
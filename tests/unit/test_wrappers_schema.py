@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 import sys
@@ -12,6 +13,7 @@ if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
 from external import msi2namd, msi2lmp  # noqa: E402
+from external._lmp_normalize import normalize_data_file  # noqa: E402
 
 
 def _pick_existing_exe():
@@ -53,6 +55,8 @@ def test_msi2namd_wrapper_schema_monkeypatch(tmp_path: Path, monkeypatch):
         errors=None,
         timeout=10,
         check=True,
+        stdout=None,
+        stderr=None,
         **_kwargs,
     ):
         # Determine output file base from "-output" arg
@@ -61,7 +65,11 @@ def test_msi2namd_wrapper_schema_monkeypatch(tmp_path: Path, monkeypatch):
         cwd_path = Path(cwd or ".")
         (cwd_path / f"{name}.pdb").write_text("ATOM  ....\n", encoding="utf-8")
         (cwd_path / f"{name}.psf").write_text("PSF   ....\n", encoding="utf-8")
-        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="ok", stderr="")
+        if stdout is not None:
+            # Output redirected to files: the child writes into the handles
+            stdout.write(b"ok")
+            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=None, stderr=None)
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=b"ok", stderr=b"")
 
     monkeypatch.setattr(msi2namd, "subprocess", pytest.importorskip("subprocess"))
     monkeypatch.setattr(msi2namd.subprocess, "run", fake_run)
@@ -93,6 +101,54 @@ def test_msi2namd_wrapper_schema_monkeypatch(tmp_path: Path, monkeypatch):
     assert outs and Path(outs["pdb_file"]).exists() and Path(outs["psf_file"]).exists()
 
 
+@pytest.mark.unit
+def test_msi2namd_run_async_gathers_independent_conversions(tmp_path: Path, monkeypatch):
+    mdf = tmp_path / "AS2.mdf"
+    car = tmp_path / "AS2.car"
+    prm = tmp_path / "parameters.prm"
+    mdf.write_text("! dummy MDF\n", encoding="utf-8")
+    car.write_text("! dummy CAR\n", encoding="utf-8")
+    prm.write_text("* parameters\n", encoding="utf-8")
+
+    exe = _pick_existing_exe()
+    if exe is None:
+        pytest.skip("No simple system binary available for existence check")
+
+    def fake_run(cmd, cwd=None, **_kwargs):
+        name = cmd[cmd.index("-output") + 1]
+        (Path(cwd) / f"{name}.pdb").write_text("ATOM  ....\n", encoding="utf-8")
+        (Path(cwd) / f"{name}.psf").write_text("PSF   ....\n", encoding="utf-8")
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=b"ok", stderr=b"")
+
+    monkeypatch.setattr(msi2namd.subprocess, "run", fake_run)
+
+    prefixes = [tmp_path / "a" / "AS2", tmp_path / "b" / "AS2"]
+
+    async def convert_all():
+        return await asyncio.gather(
+            *(
+                msi2namd.run_async(
+                    mdf_file=str(mdf),
+                    car_file=str(car),
+                    prm_file=str(prm),
+                    residue="AS2",
+                    output_prefix=str(prefix),
+                    exe_path=exe,
+                    timeout_s=5,
+                )
+                for prefix in prefixes
+            )
+        )
+
+    results = asyncio.run(convert_all())
+
+    assert [r.get("status") for r in results] == ["ok", "ok"]
+    for res, prefix in zip(results, prefixes):
+        assert Path(res["pdb_file"]).parent == prefix.parent.resolve()
+        assert Path(res["pdb_file"]).exists()
+        assert Path(res["psf_file"]).exists()
+
+
 @pytest.mark.unit
 def test_msi2lmp_wrapper_schema_and_normalization(tmp_path: Path, monkeypatch):
     # Arrange: base car/mdf and frc
@@ -126,6 +182,8 @@ def test_msi2lmp_wrapper_schema_and_normalization(tmp_path: Path, monkeypatch):
         errors=None,
         timeout=10,
         check=True,
+        stdout=None,
+        stderr=None,
         **_kwargs,
     ):
         base_stem = cmd[1]
@@ -147,7 +205,11 @@ def test_msi2lmp_wrapper_schema_and_normalization(tmp_path: Path, monkeypatch):
             ]
         )
         data_path.write_text(data_text + "\n", encoding="utf-8")
-        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="ok", stderr="")
+        if stdout is not None:
+            # Output redirected to files: the child writes into the handles
+            stdout.write(b"ok")
+            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=None, stderr=None)
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=b"ok", stderr=b"")
 
     monkeypatch.setattr(msi2lmp, "subprocess", pytest.importorskip("subprocess"))
     monkeypatch.setattr(msi2lmp.subprocess, "run", fake_run)
@@ -175,6 +237,8 @@ def test_msi2lmp_wrapper_schema_and_normalization(tmp_path: Path, monkeypatch):
     assert Path(outs["stdout_file"]).exists()
     assert Path(outs["stderr_file"]).exists()
     assert Path(outs["result_json"]).exists()
+    assert Path(outs["stdout_file"]).read_text(encoding="utf-8") == "ok"
+    assert res.get("stdout") == "ok"
 
     # Hashes exist at least for primary artifacts
     assert "lmp_data_file" in res["outputs_sha256"]
@@ -273,4 +337,102 @@ def test_msi2lmp_missing_tool_writes_result_json(tmp_path: Path):
     assert Path(outs["stdout_file"]).exists()
     assert Path(outs["stderr_file"]).exists()
     assert Path(outs["result_json"]).exists()
-    assert "Executable not found" in Path(outs["stderr_file"]).read_text(encoding="utf-8")
\ No newline at end of file
+    assert "Executable not found" in Path(outs["stderr_file"]).read_text(encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_msi2lmp_truncates_long_logs_in_envelope(tmp_path: Path, monkeypatch):
+    base = tmp_path / "hydrated"
+    (tmp_path / "hydrated.car").write_text("! header\nPBC 10.0 20.0 30.0 90.0 90.0 90.0\n", encoding="utf-8")
+    (tmp_path / "hydrated.mdf").write_text("! mdf\n", encoding="utf-8")
+    frc = tmp_path / "cvff.frc"
+    frc.write_text("* frc\n", encoding="utf-8")
+    outdir = tmp_path / "sim"
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    exe = _pick_existing_exe()
+    if exe is None:
+        pytest.skip("No simple system binary available for existence check")
+
+    # 5000 characters of stdout: more than the 4096-character envelope tail
+    long_stdout = "".join(f"{i % 10}" for i in range(4999)) + "E"
+
+    def fake_run(cmd, cwd=None, stdout=None, stderr=None, **_kwargs):
+        (Path(cwd) / f"{cmd[1]}.data").write_text(
+            "LAMMPS data (stub)\n\n0.0 9.0 xlo xhi\n0.0 19.0 ylo yhi\n0.0 29.0 zlo zhi\n", encoding="utf-8"
+        )
+        if stdout is not None:
+            stdout.write(long_stdout.encode("utf-8"))
+            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=None, stderr=None)
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=long_stdout.encode("utf-8"), stderr=b"")
+
+    monkeypatch.setattr(msi2lmp.subprocess, "run", fake_run)
+
+    res = msi2lmp.run(
+        base_name=str(base),
+        frc_file=str(frc),
+        exe_path=exe,
+        output_prefix=str(outdir / "long_logs"),
+        timeout_s=5,
+    )
+
+    assert res.get("status") == "ok"
+    assert len(res["stdout"]) == 4096
+    assert res["stdout"] == long_stdout[-4096:]
+    assert res["stdout_truncated"] is True
+    assert res["stderr_truncated"] is False
+    # The full log stays on disk
+    assert Path(res["outputs"]["stdout_file"]).read_text(encoding="utf-8") == long_stdout
+
+
+def _stub_data_text(header_lines, atom_lines):
+    return "\n".join(["LAMMPS data (stub)", "", *header_lines, "", "Atoms # full", "", *atom_lines, ""]) + "\n"
+
+
+@pytest.mark.unit
+def test_normalize_zero_z_shift_leaves_atoms_lines_verbatim(tmp_path: Path):
+    # min(z) is already 0: the legacy shift is a no-op, so Atoms lines are not reformatted
+    data_path = tmp_path / "zmin0.data"
+    data_path.write_text(
+        _stub_data_text(
+            ["0.0 9.0 xlo xhi", "0.0 19.0 ylo yhi", "0.0 29.0 zlo zhi"],
+            ["1 1 1 -0.5 1.0 2.0 0.0", "2 1 1  0.5 3.0 4.0  1.0"],
+        ),
+        encoding="utf-8",
+    )
+
+    normalize_data_file(
+        data_path, a_dim=10.0, b_dim=20.0, do_xy=True, z_target=50.0, do_z_shift=True, do_z_center=False
+    )
+
+    lines = data_path.read_text(encoding="utf-8").splitlines()
+    # Header is still normalized
+    assert "0.000000 10.000000 xlo xhi" in lines
+    assert "0.000000 20.000000 ylo yhi" in lines
+    assert "0.000000 50.000000 zlo zhi" in lines
+    # Atoms lines keep their original text
+    assert "1 1 1 -0.5 1.0 2.0 0.0" in lines
+    assert "2 1 1  0.5 3.0 4.0  1.0" in lines
+
+
+@pytest.mark.unit
+def test_normalize_already_normalized_file_is_untouched(tmp_path: Path):
+    data_path = tmp_path / "normalized.data"
+    data_path.write_text(
+        _stub_data_text(
+            ["0.000000 10.000000 xlo xhi", "0.000000 20.000000 ylo yhi", "0.000000 50.000000 zlo zhi"],
+            ["1 1 1 -0.5 1.0 2.0 0.0", "2 1 1  0.5 3.0 4.0  1.0"],
+        ),
+        encoding="utf-8",
+    )
+    before = data_path.read_bytes()
+    os.utime(data_path, ns=(1_000_000_000, 1_000_000_000))
+
+    normalize_data_file(
+        data_path, a_dim=10.0, b_dim=20.0, do_xy=True, z_target=50.0, do_z_shift=True, do_z_center=False
+    )
+
+    # Nothing to change: same bytes and the file was not rewritten (mtime preserved)
+    assert data_path.read_bytes() == before
+    assert data_path.stat().st_mtime_ns == 1_000_000_000
+    assert not (tmp_path / "normalized.data.tmp").exists()